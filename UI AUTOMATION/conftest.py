@@ -0,0 +1,131 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pytest
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "failures")
+SNIPPET_CHARS = 500
+
+
+class ArtifactWriter:
+    """Writes failure artifacts on a background thread so teardown never waits on disk I/O."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            path, data = item
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def write(self, path, data):
+        self.queue.put((path, data))
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+
+class StepRecorder:
+    """
+    Cheap in-memory ring buffer of test steps.
+
+    Only timings and element references are kept on the hot path; the elements'
+    HTML is read from the browser only if the test fails.
+    """
+
+    def __init__(self, maxlen=200):
+        self.t0 = time.perf_counter()
+        self.steps = deque(maxlen=maxlen)
+
+    @contextmanager
+    def step(self, name, element=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, start - self.t0, time.perf_counter() - start, element))
+
+    def note(self, name, element=None):
+        self.steps.append((name, time.perf_counter() - self.t0, 0.0, element))
+
+    def dump(self):
+        records = []
+        for name, offset, duration, element in self.steps:
+            record = {"step": name, "at": round(offset, 3), "duration": round(duration, 3)}
+            if element is not None:
+                try:
+                    record["dom"] = (element.get_attribute("outerHTML") or "")[:SNIPPET_CHARS]
+                except Exception:
+                    record["dom"] = "<element no longer available>"
+            records.append(record)
+        return records
+
+
+def pytest_sessionstart(session):
+    session.config._wall_clock_start = time.perf_counter()
+    session.config._artifact_writer = ArtifactWriter()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    writer = getattr(session.config, "_artifact_writer", None)
+    if writer:
+        writer.close()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+@pytest.fixture(autouse=True)
+def recorder(request):
+    """
+    Step recorder for every test. If the test fails, a screenshot, the page source and
+    the recorded steps are saved under failures/<test>/ by the background writer.
+    """
+    # Requesting the driver here makes it outlive this fixture's teardown
+    driver = request.getfixturevalue("driver") if "driver" in request.fixturenames else None
+    steps = StepRecorder()
+    yield steps
+
+    reports = [getattr(request.node, f"rep_{when}", None) for when in ("setup", "call")]
+    if not any(report and report.failed for report in reports):
+        return
+
+    writer = request.config._artifact_writer
+    target = os.path.join(ARTIFACT_DIR, re.sub(r"[^\w.-]+", "_", request.node.nodeid))
+    writer.write(os.path.join(target, "steps.json"), json.dumps(steps.dump(), indent=2))
+    if driver is not None:
+        try:
+            writer.write(os.path.join(target, "screenshot.png"), driver.get_screenshot_as_png())
+            writer.write(os.path.join(target, "page.html"), driver.page_source)
+        except Exception as e:
+            writer.write(os.path.join(target, "capture_error.txt"), str(e))
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Prints the total wall-clock time of the run (with pytest-xdist: across all workers)."""
+    start = getattr(config, "_wall_clock_start", None)
+    if start is None:
+        return
+    workers = getattr(config.option, "numprocesses", None) or 1
+    terminalreporter.write_sep("=", f"total wall-clock: {time.perf_counter() - start:.1f}s ({workers} worker(s))")
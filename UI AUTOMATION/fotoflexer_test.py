@@ -1,485 +1,286 @@
 import os
-import time
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 
 # Constants
 URL = "https://fotoflexer.com/editor/"
-TEST_IMAGE_PATH = r"C:\Users\fathi\OneDrive\Pictures\mountains.jpg"  # User provided path
-
-@pytest.fixture(scope="module")
-def driver():
-    """Setup and teardown of the Chrome driver."""
-    options = webdriver.ChromeOptions()
-    # options.add_argument("--headless") # Comment out to see the UI
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-search-engine-choice-screen")
-    
-    drv = webdriver.Chrome(options=options)
+# Override with FOTOFLEXER_TEST_IMAGE to use another picture
+TEST_IMAGE_PATH = os.environ.get(
+    "FOTOFLEXER_TEST_IMAGE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_image.jpg")
+)
+WAIT_TIMEOUT = 15
+
+# Each tool is checked by its own test so they can run in parallel (pytest -n auto)
+TOOLS = ["FILTER", "CROP", "RESIZE"]
+
+OPEN_PHOTO_BUTTON = "button.mat-flat-button.mat-primary"
+TOOL_BUTTONS = "editor-controls button, button.control-button"
+ACTION_BUTTON_TEXTS = ["Apply", "OK", "Done", "Save", "Confirm", "✓", "✔"]
+ACTION_BUTTON_CLASSES = ["apply-button", "mat-flat-button", "mat-primary", "mat-button-base"]
+
+
+def wait_for(driver, condition, timeout=WAIT_TIMEOUT, message=""):
+    """Shared wait helper: polls `condition` instead of sleeping a fixed time."""
+    return WebDriverWait(
+        driver, timeout, poll_frequency=0.1,
+        ignored_exceptions=(StaleElementReferenceException,)
+    ).until(condition, message)
+
+
+def first_visible(selectors):
+    """Condition: the first displayed element matching any of the CSS selectors."""
+    def condition(driver):
+        for selector in selectors:
+            for element in driver.find_elements(By.CSS_SELECTOR, selector):
+                if element.is_displayed():
+                    return element
+        return False
+    return condition
+
+
+def input_value_is(element, value):
+    return lambda driver: element.get_attribute("value") == value
+
+
+@pytest.fixture
+def driver(driver_pool):
+    """A Chrome driver from the session pool, reset and returned after the test."""
+    drv = driver_pool.acquire()
     yield drv
-    drv.quit()
+    driver_pool.release(drv)
 
-@pytest.fixture(scope="module")
-def wait(driver):
-    return WebDriverWait(driver, 15)
 
-def test_open_editor(driver):
-    """Test 1: The editor page opens successfully."""
+def open_editor(driver):
     driver.get(URL)
-    assert "FotoFlexer" in driver.title, "Title does not match expected."
-    print("\n[PASS] Editor Page Opened")
+    wait_for(driver, EC.title_contains("FotoFlexer"), message="Editor page did not open.")
 
-def test_upload_image(driver, wait):
-    """Test 2: An image can be uploaded."""
-    # FotoFlexer has a hidden file input or relies on the 'Open Photo' button.
-    # We will try to find the hidden input directly first.
-    
-    # Wait for page load
-    time.sleep(2) 
-    
-    try:
-        # Try to locate the file input. 
-        # Based on inspection, it might be dynamically created or just hidden.
-        # Often it's input[type='file'].
-        file_input = driver.find_element(By.CSS_SELECTOR, "input[type='file']")
-    except:
-        # If not found immediately, maybe we need to click "Open Photo" first to trigger it?
-        # But usually input[type=file] is present. Let's try injecting one if needed 
-        # OR just assume the standard one exists.
-        # Let's try to click "Open Photo" and see if input appears if not found.
-        open_btns = driver.find_elements(By.CSS_SELECTOR, "button.mat-flat-button.mat-primary")
-        if open_btns:
-            open_btns[0].click()
-            time.sleep(1)
-        file_input = driver.find_element(By.CSS_SELECTOR, "input[type='file']")
-
-    # Upload the file
-    # Ensure test image exists
+
+def upload_image(driver):
     if not os.path.exists(TEST_IMAGE_PATH):
         pytest.fail(f"Test image not found at {TEST_IMAGE_PATH}")
 
+    # FotoFlexer has a hidden file input; if it is not in the DOM yet, 'Open Photo' creates it.
+    file_inputs = driver.find_elements(By.CSS_SELECTOR, "input[type='file']")
+    if not file_inputs:
+        wait_for(driver, EC.element_to_be_clickable((By.CSS_SELECTOR, OPEN_PHOTO_BUTTON))).click()
+    file_input = wait_for(driver, EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']")))
     file_input.send_keys(TEST_IMAGE_PATH)
-    
-    # Wait for the editor workspace to load (canvas confirmation)
-    # The 'Open Photo' buttons should disappear or the main canvas should appear.
+
+    # The 'Open Photo' buttons disappear and the canvas and tools appear once the image is loaded
     try:
-        wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, "button.mat-flat-button.mat-primary")))
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "canvas")))
-        print("\n[PASS] Image Uploaded Successfully")
-        time.sleep(2) # Visual delay to verify image
+        wait_for(driver, EC.invisibility_of_element_located((By.CSS_SELECTOR, OPEN_PHOTO_BUTTON)))
+        wait_for(driver, EC.presence_of_element_located((By.CSS_SELECTOR, "canvas")))
+        wait_for(driver, EC.visibility_of_element_located((By.CSS_SELECTOR, TOOL_BUTTONS)))
     except TimeoutException:
         pytest.fail("Editor did not load after image upload.")
-def test_tools_visibility_and_interaction(driver, wait):
-    """Test 3: All editor tools are visible, clickable, and function correctly."""
-    
-    # Wait for tools to be visible
-    time.sleep(2)
-    
-    # Based on the HTML, tools might be in <editor-controls> or similar
-    # Let's try to find tool buttons in the editor controls
-    try:
-        # First, find the editor controls container
-        tools = wait.until(EC.presence_of_all_elements_located(
-            (By.CSS_SELECTOR, "editor-controls button.control-button, editor-controls .control-button")
+
+
+@pytest.fixture
+def editor(driver, recorder):
+    """A driver with the editor open and the test image already uploaded."""
+    with recorder.step("open editor"):
+        open_editor(driver)
+    with recorder.step("upload image"):
+        upload_image(driver)
+    return driver
+
+
+def find_tool(driver, tool_name):
+    """Returns the tool button whose label contains tool_name, or None."""
+    for tool in driver.find_elements(By.CSS_SELECTOR, TOOL_BUTTONS):
+        label = tool.text.strip()
+        if not label:
+            name_spans = tool.find_elements(By.CSS_SELECTOR, "span.name, .name")
+            label = name_spans[0].text.strip() if name_spans else ""
+        if tool_name in label.upper():
+            return tool
+    return None
+
+
+def find_action_buttons(driver):
+    """Apply/OK-style buttons by text or class, deduplicated by position."""
+    action_buttons = []
+    for text in ACTION_BUTTON_TEXTS:
+        # XPath for case-insensitive text search
+        action_buttons.extend(driver.find_elements(
+            By.XPATH,
+            f"//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{text.lower()}')]"
         ))
-    except TimeoutException:
-        # Try alternative selectors
-        try:
-            tools = wait.until(EC.presence_of_all_elements_located(
-                (By.CSS_SELECTOR, "button.control-button, .control-button, [class*='control-button']")
-            ))
-        except TimeoutException:
-            # Look for any buttons in editor controls
-            try:
-                tools = wait.until(EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, "editor-controls button")
-                ))
-            except TimeoutException:
-                pytest.fail("No tools found. Editor might not be loaded properly.")
-    
-    tool_count = len(tools)
-    print(f"\n[INFO] Found {tool_count} tools to test.")
-    
-    # Debug: Print all found tools
-    print("\n[DEBUG] Available tools:")
-    for i, tool in enumerate(tools):
-        try:
-            tool_text = tool.text.strip()
-            tool_class = tool.get_attribute("class") or ""
-            print(f"  {i+1}. Text: '{tool_text}', Class: '{tool_class}'")
-        except:
-            print(f"  {i+1}. Could not read tool info")
-    
-    # Add imports at the top of the function if not already there
-    from selenium.webdriver.common.keys import Keys
-    from selenium.webdriver.common.action_chains import ActionChains
-    
-    for i in range(min(3, tool_count)):  # Test only first 3 tools for now
-        # Re-fetch the list of tools
-        try:
-            tools = wait.until(EC.presence_of_all_elements_located(
-                (By.CSS_SELECTOR, "editor-controls button, button.control-button")
-            ))
-            tool = tools[i]
-        except TimeoutException:
-            pytest.fail("Tools list mismatch or failed to reload.")
-        
-        # Get tool info
+    for class_name in ACTION_BUTTON_CLASSES:
+        action_buttons.extend(driver.find_elements(By.CSS_SELECTOR, f"button[class*='{class_name}']"))
+
+    unique_buttons = []
+    seen = set()
+    for btn in action_buttons:
         try:
-            tool_text = tool.text.strip()
-            tool_name = tool_text if tool_text else f"Tool-{i+1}"
-        except:
-            tool_name = f"Tool-{i+1}"
-        
-        # Also try to find tool name from child elements
-        if not tool_name or tool_name == f"Tool-{i+1}":
-            try:
-                # Look for span with name
-                name_spans = tool.find_elements(By.CSS_SELECTOR, "span.name, .name")
-                if name_spans:
-                    tool_name = name_spans[0].text.strip()
-            except:
-                pass
-            
-        print(f"\nTesting Tool: {tool_name}")
-        
-        # 1. Check Visibility
-        if not tool.is_displayed():
-            print(f"  - {tool_name}: [SKIP] Element is present but not visible.")
+            btn_key = (btn.location['x'], btn.location['y'], btn.id)
+        except StaleElementReferenceException:
             continue
-            
-        print(f"  - {tool_name}: Visible")
+        if btn_key not in seen:
+            seen.add(btn_key)
+            unique_buttons.append(btn)
+    return unique_buttons
+
+
+def visible_action_button(driver):
+    for btn in find_action_buttons(driver):
+        if btn.is_displayed() and btn.is_enabled():
+            return btn
+    return False
+
+
+def number_inputs(driver):
+    """Condition: at least two number inputs, preferring the resize drawer's."""
+    inputs = (driver.find_elements(By.CSS_SELECTOR, "resize-drawer input[type='number']")
+              or driver.find_elements(By.CSS_SELECTOR, "input[type='number']"))
+    return inputs if len(inputs) >= 2 else False
+
+
+def set_number_input(driver, element, value):
+    element.clear()
+    element.send_keys(value)
+    try:
+        wait_for(driver, input_value_is(element, value), timeout=2)
+    except TimeoutException:
+        # Some Angular inputs ignore synthetic keystrokes; set the value directly
+        driver.execute_script("arguments[0].value = arguments[1];", element, value)
+    print(f"    - Input value: {element.get_attribute('value')}")
+
+
+def handle_filter(driver):
+    print("  - [FILTER TOOL] Looking for filter options...")
+    filter_selectors = [
+        "mat-grid-tile",  # Angular Material grid tiles
+        ".mat-grid-tile",
+        "div.filter-item",
+        "div.filter-option",
+        "mat-card",  # Filter cards
+        ".mat-card",
+        "div[class*='filter']",
+        "div.preview-container",  # Filter preview containers
+        "img[class*='filter']"  # Filter preview images
+    ]
+    try:
+        option = wait_for(driver, first_visible(filter_selectors))
+    except TimeoutException:
+        pytest.fail("No filter options appeared.")
+    print(f"    - Clicking filter option: '{option.text.strip().upper()}'")
+    option.click()
+
+
+def handle_resize(driver):
+    print("  - [RESIZE TOOL] Entering width and height values...")
+    width_selectors = [
+        "input#width",
+        "input[name='width']",
+        "input[formcontrolname='width']",
+        "input[placeholder*='width' i]",
+        "input[aria-label*='width' i]"
+    ]
+    height_selectors = [
+        "input#height",
+        "input[name='height']",
+        "input[formcontrolname='height']",
+        "input[placeholder*='height' i]",
+        "input[aria-label*='height' i]"
+    ]
+    try:
+        width_input = wait_for(driver, first_visible(width_selectors), timeout=5)
+        height_input = wait_for(driver, first_visible(height_selectors), timeout=5)
+    except TimeoutException:
+        # Fall back to the first two number inputs of the resize drawer (width, height)
+        inputs = wait_for(driver, number_inputs, timeout=5, message="Could not find width/height inputs.")
+        width_input, height_input = inputs[0], inputs[1]
+
+    set_number_input(driver, width_input, "800")
+    set_number_input(driver, height_input, "600")
+
+    for checkbox in driver.find_elements(By.CSS_SELECTOR, "mat-checkbox, input[type='checkbox']"):
+        parent_text = checkbox.find_element(By.XPATH, "..").text.upper()
+        if "MAINTAIN" in parent_text or "ASPECT" in parent_text or "RATIO" in parent_text:
+            state = "checked" if checkbox.is_selected() else "not checked"
+            print(f"    - 'Maintain Aspect Ratio' is {state}")
+            break
+
+
+TOOL_HANDLERS = {
+    "FILTER": handle_filter,
+    "RESIZE": handle_resize,
+}
+
+
+def test_open_editor(driver):
+    """The editor page opens successfully."""
+    open_editor(driver)
+    assert "FotoFlexer" in driver.title, "Title does not match expected."
+    print("\n[PASS] Editor Page Opened")
 
-        # 2. Click Tool
+
+def test_upload_image(editor):
+    """An image can be uploaded."""
+    assert editor.find_elements(By.CSS_SELECTOR, "canvas")
+    print("\n[PASS] Image Uploaded Successfully")
+
+
+@pytest.mark.parametrize("tool_name", TOOLS)
+def test_tool(editor, recorder, tool_name):
+    """The tool is visible, opens its panel, and can be applied or dismissed."""
+    driver = editor
+    with recorder.step("find tool"):
+        tool = wait_for(driver, lambda d: find_tool(d, tool_name), message=f"{tool_name} tool not found.")
+    print(f"\nTesting Tool: {tool_name}")
+    assert tool.is_displayed(), f"{tool_name} is present but not visible."
+
+    with recorder.step("click tool", element=tool):
         try:
-            print(f"  - Clicking tool at location: {tool.location}")
             tool.click()
-            print(f"  - {tool_name}: Clicked")
-            time.sleep(2)  # Wait for panel to open
         except Exception as e:
-            print(f"  - Error clicking: {e}")
-            # Try JavaScript click
-            try:
-                driver.execute_script("arguments[0].click();", tool)
-                print(f"  - {tool_name}: Clicked (JavaScript)")
-                time.sleep(2)
-            except Exception as e2:
-                print(f"  - JavaScript click also failed: {e2}")
-                continue
-
-        # 3. Take screenshot to see what opened
-        driver.save_screenshot(f"debug_{tool_name.lower().replace(' ', '_')}_panel.png")
-        print(f"  - Screenshot saved for debugging")
-
-        # 4. SPECIAL HANDLING FOR SPECIFIC TOOLS
-        tool_name_upper = tool_name.upper()
-        
-        # Handle FILTER tool
-        if "FILTER" in tool_name_upper:
-            print("  - [FILTER TOOL] Looking for filter options...")
-            time.sleep(2)
-            
-            # Look for filter options - they might be in a grid/list
-            filter_selectors = [
-                "mat-grid-tile",  # Angular Material grid tiles
-                ".mat-grid-tile",
-                "div.filter-item",
-                "div.filter-option",
-                "mat-card",  # Filter cards
-                ".mat-card",
-                "div[class*='filter']",
-                "div.preview-container",  # Filter preview containers
-                "img[class*='filter']"  # Filter preview images
-            ]
-            
-            for selector in filter_selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        print(f"  - Found {len(elements)} elements with selector: {selector}")
-                        # Try to click the first one (like "Vintage")
-                        for elem in elements[:3]:  # Try first 3
-                            try:
-                                if elem.is_displayed() and elem.is_enabled():
-                                    elem_text = elem.text.strip().upper()
-                                    print(f"    - Element text: '{elem_text}'")
-                                    elem.click()
-                                    print(f"    - Clicked filter option")
-                                    time.sleep(2)  # Wait for Apply button
-                                    break
-                            except:
-                                continue
-                except:
-                    continue
-        
-        # Handle RESIZE tool - UPDATED BASED ON SCREENSHOT
-        elif "RESIZE" in tool_name_upper or "SIZE" in tool_name_upper:
-            print("  - [RESIZE TOOL] Entering width and height values...")
-            time.sleep(2)
-            
-            # Take another screenshot to see the resize panel
-            driver.save_screenshot(f"debug_{tool_name.lower().replace(' ', '_')}_resize_panel.png")
-            
-            # Based on the screenshot HTML, the inputs are in resize-drawer with specific IDs
-            print("  - Looking for resize inputs...")
-            
-            # METHOD 1: Try to find inputs by ID (from HTML)
-            try:
-                # Look for width input by ID or formcontrolname
-                width_input = None
-                height_input = None
-                
-                # Try multiple selectors for width
-                width_selectors = [
-                    "input#width",  # By ID
-                    "input[name='width']",
-                    "input[formcontrolname='width']",
-                    "input[placeholder*='width' i]",
-                    "input[aria-label*='width' i]"
-                ]
-                
-                for selector in width_selectors:
-                    try:
-                        elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                        for elem in elements:
-                            if elem.is_displayed():
-                                width_input = elem
-                                print(f"    - Found width input with selector: {selector}")
-                                break
-                        if width_input:
-                            break
-                    except:
-                        continue
-                
-                # Try multiple selectors for height
-                height_selectors = [
-                    "input#height",  # By ID (from HTML)
-                    "input[name='height']",
-                    "input[formcontrolname='height']",
-                    "input[placeholder*='height' i]",
-                    "input[aria-label*='height' i]"
-                ]
-                
-                for selector in height_selectors:
-                    try:
-                        elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                        for elem in elements:
-                            if elem.is_displayed():
-                                height_input = elem
-                                print(f"    - Found height input with selector: {selector}")
-                                break
-                        if height_input:
-                            break
-                    except:
-                        continue
-                
-                # METHOD 2: If not found by ID, look for inputs in resize-drawer
-                if not width_input or not height_input:
-                    print("    - Trying to find inputs in resize-drawer...")
-                    try:
-                        # Find all inputs in the resize drawer
-                        resize_inputs = driver.find_elements(By.CSS_SELECTOR, "resize-drawer input[type='number']")
-                        if len(resize_inputs) >= 2:
-                            # First is likely width, second is height
-                            width_input = resize_inputs[0]
-                            height_input = resize_inputs[1]
-                            print(f"    - Found {len(resize_inputs)} number inputs in resize-drawer")
-                    except:
-                        pass
-                
-                # METHOD 3: Look for all number inputs
-                if not width_input or not height_input:
-                    print("    - Trying all number inputs on page...")
-                    try:
-                        all_number_inputs = driver.find_elements(By.CSS_SELECTOR, "input[type='number']")
-                        if len(all_number_inputs) >= 2:
-                            width_input = all_number_inputs[0]
-                            height_input = all_number_inputs[1]
-                            print(f"    - Found {len(all_number_inputs)} number inputs on page")
-                    except:
-                        pass
-                
-                # Enter values into width input
-                if width_input:
-                    try:
-                        # Clear the input first
-                        width_input.clear()
-                        time.sleep(0.2)
-                        
-                        # Enter new value
-                        width_input.send_keys("800")
-                        print(f"    - Entered width: 800")
-                        time.sleep(0.5)
-                        
-                        # Verify the value was entered
-                        current_value = width_input.get_attribute("value")
-                        print(f"    - Width input current value: {current_value}")
-                    except Exception as e:
-                        print(f"    - Error entering width: {e}")
-                        # Try JavaScript to set value
-                        try:
-                            driver.execute_script("arguments[0].value = '800';", width_input)
-                            print(f"    - Set width to 800 using JavaScript")
-                        except:
-                            print(f"    - JavaScript also failed for width")
-                else:
-                    print("    - Could not find width input")
-                
-                # Enter values into height input
-                if height_input:
-                    try:
-                        # Clear the input first
-                        height_input.clear()
-                        time.sleep(0.2)
-                        
-                        # Enter new value
-                        height_input.send_keys("600")
-                        print(f"    - Entered height: 600")
-                        time.sleep(0.5)
-                        
-                        # Verify the value was entered
-                        current_value = height_input.get_attribute("value")
-                        print(f"    - Height input current value: {current_value}")
-                    except Exception as e:
-                        print(f"    - Error entering height: {e}")
-                        # Try JavaScript to set value
-                        try:
-                            driver.execute_script("arguments[0].value = '600';", height_input)
-                            print(f"    - Set height to 600 using JavaScript")
-                        except:
-                            print(f"    - JavaScript also failed for height")
-                else:
-                    print("    - Could not find height input")
-                
-                # Handle "Maintain Aspect Ratio" checkbox
-                try:
-                    # Look for checkbox
-                    checkbox_selectors = [
-                        "input[type='checkbox']",
-                        "mat-checkbox",
-                        ".checkbox-container input",
-                        "input[formcontrolname*='aspect']",
-                        "input[name*='aspect']"
-                    ]
-                    
-                    for selector in checkbox_selectors:
-                        try:
-                            checkboxes = driver.find_elements(By.CSS_SELECTOR, selector)
-                            for checkbox in checkboxes:
-                                if checkbox.is_displayed():
-                                    # Get parent label text to identify
-                                    try:
-                                        parent_text = checkbox.find_element(By.XPATH, "..").text.upper()
-                                        if "MAINTAIN" in parent_text or "ASPECT" in parent_text or "RATIO" in parent_text:
-                                            # Check if it's checked
-                                            is_checked = checkbox.is_selected()
-                                            if is_checked:
-                                                print(f"    - 'Maintain Aspect Ratio' is checked")
-                                                # If we want to unlock aspect ratio, we would uncheck it
-                                                # checkbox.click()
-                                                # print(f"    - Unchecked 'Maintain Aspect Ratio'")
-                                            else:
-                                                print(f"    - 'Maintain Aspect Ratio' is not checked")
-                                            break
-                                    except:
-                                        pass
-                        except:
-                            continue
-                except Exception as e:
-                    print(f"    - Error handling checkbox: {e}")
-                
-            except Exception as e:
-                print(f"    - Error in resize tool handling: {e}")
-        
-        # 5. Look for Apply button or action buttons
-        print("  - Looking for Apply/action buttons...")
-        
-        # Try multiple ways to find action buttons
-        action_buttons = []
-        
-        # Look by text content (case-insensitive)
-        button_texts = ["Apply", "OK", "Done", "Save", "Confirm", "✓", "✔"]
-        for text in button_texts:
-            try:
-                # XPath for case-insensitive text search
-                buttons = driver.find_elements(
-                    By.XPATH, 
-                    f"//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{text.lower()}')]"
-                )
-                action_buttons.extend(buttons)
-            except:
-                pass
-        
-        # Look by class names
-        button_classes = ["apply-button", "mat-flat-button", "mat-primary", "mat-button-base"]
-        for class_name in button_classes:
-            try:
-                buttons = driver.find_elements(By.CSS_SELECTOR, f"button[class*='{class_name}']")
-                action_buttons.extend(buttons)
-            except:
-                pass
-        
-        # Remove duplicates
-        unique_buttons = []
-        seen = set()
-        for btn in action_buttons:
-            try:
-                btn_id = btn.id
-            except:
-                btn_id = None
-            btn_key = (btn.location['x'], btn.location['y'], btn_id)
-            if btn_key not in seen:
-                seen.add(btn_key)
-                unique_buttons.append(btn)
-        
-        print(f"  - Found {len(unique_buttons)} potential action buttons")
-        
-        # Click the first visible action button
-        clicked = False
-        for btn in unique_buttons[:5]:  # Try first 5
-            try:
-                if btn.is_displayed() and btn.is_enabled():
-                    btn_text = btn.text.strip()
-                    print(f"    - Clicking button: '{btn_text}'")
-                    btn.click()
-                    clicked = True
-                    time.sleep(2)
-                    break
-            except:
-                continue
-        
-        if not clicked:
-            print("  - No action button found/clicked")
-            # Press ESC to close any open panel
-            try:
-                ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-                print("  - Pressed ESC to close panel")
-                time.sleep(1)
-            except:
-                pass
-        
-        # 6. Wait to return to main tools
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "editor-controls")))
-            print(f"  - {tool_name}: Returned to main menu")
-        except TimeoutException:
-            print(f"  - [WARNING] May still be in tool panel")
-        
-        time.sleep(1)  # Brief pause between tools
-
-    print("\n[PASS] Tools tested successfully")
-
-def test_no_crash_final(driver):
-    """Final check that the app is still alive."""
-    assert len(driver.window_handles) > 0
+            print(f"  - Error clicking ({e}), using JavaScript click")
+            driver.execute_script("arguments[0].click();", tool)
+    print(f"  - {tool_name}: Clicked")
+
+    # Panel is open once an action button shows up (or the tool's drawer renders)
+    try:
+        with recorder.step("wait for panel"):
+            panel = wait_for(driver, lambda d: visible_action_button(d) or first_visible(["[class*='drawer']"])(d))
+        recorder.note("panel opened", element=panel)
+    except TimeoutException:
+        pytest.fail(f"{tool_name} panel did not open.")
+
+    handler = TOOL_HANDLERS.get(tool_name)
+    if handler:
+        with recorder.step(f"{tool_name.lower()} options"):
+            handler(driver)
+
+    try:
+        with recorder.step("wait for action button"):
+            button = wait_for(driver, visible_action_button, timeout=5)
+        print(f"  - Clicking button: '{button.text.strip()}'")
+        with recorder.step("click action button", element=button):
+            button.click()
+    except TimeoutException:
+        print("  - No action button found, pressing ESC to close the panel")
+        ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+
+    try:
+        with recorder.step("return to main tools"):
+            wait_for(driver, EC.visibility_of_element_located((By.CSS_SELECTOR, "editor-controls")))
+        print(f"  - {tool_name}: Returned to main menu")
+    except TimeoutException:
+        print("  - [WARNING] May still be in tool panel")
+
+
+def test_no_crash_final(editor):
+    """The app is still alive with an image loaded."""
+    assert len(editor.window_handles) > 0
     # Check for any console errors (if supported by driver logging)
-    logs = driver.get_log('browser')
+    logs = editor.get_log('browser')
     errors = [entry for entry in logs if entry['level'] == 'SEVERE']
     if errors:
         print("\n[WARNING] Browser console errors detected:")
@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for LLM requests.
+
+    Requests are grouped into windows of roughly 2 x `limit` completions. After each window
+    the average latency is compared to the best latency seen so far (the no-queueing
+    baseline):
+      - latency within `tolerance` x baseline while every slot was in use -> limit + 1,
+        kept only if throughput (completions/s) rises by at least `gain` times what one more
+        slot would add if the server scaled linearly; otherwise it is undone
+      - latency above that, or any failed request -> limit x `backoff`
+    so the number of in-flight requests grows while extra slots actually buy throughput
+    and shrinks as soon as requests start queueing on the server. After any decrease the
+    limit is held for `hold` windows, and the window right after a change is skipped, since
+    its requests were mostly admitted under the old limit.
+    """
+
+    def __init__(self, initial=1, min_limit=1, max_limit=16, tolerance=1.5, backoff=0.75, gain=0.5, hold=10):
+        self.logger = logging.getLogger(__name__)
+        self.limit = max(min_limit, min(initial, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.gain = gain
+        self.hold = hold
+        self.in_flight = 0
+        self.baseline = None
+        self._grown_from = None  # throughput of the window before the last increase
+        self._holding = 0
+        self._settling = False
+        self.history = [(time.time(), self.limit)]
+        self._cond = threading.Condition()
+        self._reset_window()
+
+    def _reset_window(self):
+        self._window_started = self._last_change = time.time()
+        self._window_latencies = []
+        self._window_failures = 0
+        self._window_peak = self.in_flight
+        self._window_busy = 0.0  # integral of in_flight over time
+
+    def _track(self):
+        now = time.time()
+        self._window_busy += self.in_flight * (now - self._last_change)
+        self._last_change = now
+
+    def acquire(self):
+        """Blocks until a request slot is free."""
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self._track()
+            self.in_flight += 1
+            self._window_peak = max(self._window_peak, self.in_flight)
+
+    def release(self, latency, ok=True):
+        """Frees the slot and records the request's latency."""
+        with self._cond:
+            self._track()
+            self.in_flight -= 1
+            if ok:
+                self._window_latencies.append(latency)
+            else:
+                self._window_failures += 1
+            if len(self._window_latencies) + self._window_failures >= max(2 * self.limit, 6):
+                self._adjust()
+            self._cond.notify_all()
+
+    def _adjust(self):
+        if self._settling:
+            # Requests completing right after a change were mostly admitted under the old limit
+            self._settling = False
+            self._reset_window()
+            return
+        elapsed = max(time.time() - self._window_started, 1e-9)
+        completed = len(self._window_latencies)
+        avg = sum(self._window_latencies) / completed if completed else None
+        # Little's law: average requests in flight / average latency. Unlike completions per
+        # window it does not jump when the server finishes a batch of parallel requests at once
+        throughput = self._window_busy / elapsed / avg if avg else 0.0
+
+        if avg is not None:
+            # Let the baseline creep up slowly so an early lucky window does not pin it forever
+            self.baseline = avg if self.baseline is None else min(self.baseline * 1.02, avg)
+
+        old_limit = self.limit
+        if self._window_failures or avg is None:
+            self.limit = max(self.min_limit, int(self.limit * self.backoff))
+            reason = f"{self._window_failures} failed requests"
+        elif avg > self.tolerance * self.baseline:
+            self.limit = max(self.min_limit, int(self.limit * self.backoff))
+            reason = f"latency {avg:.2f}s vs baseline {self.baseline:.2f}s"
+        elif self._grown_from is not None and throughput < self._grown_from * (1 + self.gain / (self.limit - 1)):
+            # The last extra slot only added queueing on the server; give it back
+            self.limit = max(self.min_limit, self.limit - 1)
+            reason = f"throughput did not improve on {self._grown_from:.2f} req/s"
+        elif self._window_peak >= self.limit and not self._holding:
+            self.limit = min(self.max_limit, self.limit + 1)
+            reason = f"latency flat at {avg:.2f}s (baseline {self.baseline:.2f}s)"
+        else:
+            self._holding = max(0, self._holding - 1)
+            reason = None
+
+        if self.limit != old_limit:
+            self.history.append((time.time(), self.limit))
+            self.logger.info(
+                f"Concurrency limit {old_limit} -> {self.limit}: {reason}, throughput {throughput:.2f} req/s"
+            )
+        self._grown_from = throughput if self.limit > old_limit else None
+        self._settling = self.limit != old_limit
+        if self.limit < old_limit:
+            # Measure the lower limit for a while before probing upwards again
+            self._holding = self.hold
+        self._reset_window()
+
+    def log_history(self):
+        """Logs a summary of the limit over the run (each change is logged as it happens)."""
+        now = time.time()
+        limits = [limit for _, limit in self.history]
+        weighted = 0.0
+        for (t, limit), (t_next, _) in zip(self.history, self.history[1:] + [(now, None)]):
+            weighted += limit * (t_next - t)
+        duration = now - self.history[0][0]
+        average = weighted / duration if duration > 0 else self.limit
+        self.logger.info(
+            f"Concurrency limit: {len(self.history) - 1} changes, range {min(limits)}-{max(limits)}, "
+            f"time-weighted average {average:.1f}, final {self.limit}"
+        )
@@ -1,6 +1,5 @@
 
-from selenium import webdriver
-from selenium.webdriver.edge.service import Service
+import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
@@ -9,10 +8,16 @@ from selenium.webdriver.support import expected_conditions as EC
 QUERY = "wikipedia"
 WAIT_TIME = 5
 
-driver = webdriver.Edge()
-wait = WebDriverWait(driver, WAIT_TIME)
 
-try:
+@pytest.fixture
+def driver(driver_pool):
+    drv = driver_pool.acquire("edge")
+    yield drv
+    driver_pool.release(drv, "edge")
+
+
+def test_google_search(driver):
+    wait = WebDriverWait(driver, WAIT_TIME)
     driver.get("https://www.google.com")
 
     search_box = wait.until(
@@ -26,5 +31,6 @@ try:
     )
     link.click()
 
-finally:
-    driver.quit()
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
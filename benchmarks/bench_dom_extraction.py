@@ -0,0 +1,96 @@
+"""
+BeautifulSoup (page_source) vs. in-browser (execute_script) extraction on the same pages.
+
+Every URL is loaded once; then both extraction paths run against the loaded page. For each
+path the bytes received over the WebDriver wire, the Python CPU time (thread_time) and the
+wall time are recorded, and the extracted texts and link sets are compared.
+
+    python benchmarks/bench_dom_extraction.py urls.txt --headless
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from dom_extraction import extract_in_browser
+from page_load import navigate
+from scraper import WebScraper, extract_content, extract_links, resolve_links
+
+
+def soup_path(driver, url):
+    cpu, wall = time.thread_time(), time.perf_counter()
+    page_source = driver.page_source
+    text, soup = extract_content(page_source, url)
+    links = extract_links(soup, url)
+    return text, set(links), len(page_source.encode("utf-8")), time.thread_time() - cpu, time.perf_counter() - wall
+
+
+def dom_path(driver, url):
+    cpu, wall = time.thread_time(), time.perf_counter()
+    result = extract_in_browser(driver, url)
+    links = resolve_links(result["hrefs"], url)
+    transferred = len(json.dumps(result).encode("utf-8"))
+    return result["text"], set(links), transferred, time.thread_time() - cpu, time.perf_counter() - wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare page_source + BeautifulSoup with in-browser extraction")
+    parser.add_argument("urls", help="Text file with one URL per line")
+    parser.add_argument("--headless", action="store_true", help="Run the browser in headless mode")
+    parser.add_argument("--output", default="dom_extraction_report.json", help="Where to write per-URL results (default: dom_extraction_report.json)")
+    args = parser.parse_args()
+
+    with open(args.urls, encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    logging.disable(logging.INFO)
+    scraper = WebScraper(headless=args.headless, page_load_strategy="eager")
+    report = {}
+    try:
+        for url in urls:
+            try:
+                navigate(scraper.driver, url, scraper.page_load_strategy)
+                soup_text, soup_links, soup_bytes, soup_cpu, soup_wall = soup_path(scraper.driver, url)
+                dom_text, dom_links, dom_bytes, dom_cpu, dom_wall = dom_path(scraper.driver, url)
+            except Exception as e:
+                report[url] = {"error": str(e)}
+                continue
+            report[url] = {
+                "soup": {"bytes": soup_bytes, "cpu": soup_cpu, "wall": soup_wall},
+                "dom": {"bytes": dom_bytes, "cpu": dom_cpu, "wall": dom_wall},
+                "same_text": soup_text == dom_text,
+                "same_links": soup_links == dom_links,
+            }
+    finally:
+        scraper.close()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+
+    print(f"{'url':50} {'soup KB':>8} {'dom KB':>7} {'soup CPU ms':>12} {'dom CPU ms':>11} {'CPU saved':>10} {'same text/links':>16}")
+    rows = [(url, row) for url, row in report.items() if "error" not in row]
+    for url, row in rows:
+        soup, dom = row["soup"], row["dom"]
+        print(
+            f"{url[:50]:50} {soup['bytes'] / 1024:>8.1f} {dom['bytes'] / 1024:>7.1f} {soup['cpu'] * 1000:>12.1f} "
+            f"{dom['cpu'] * 1000:>11.1f} {(soup['cpu'] - dom['cpu']) * 1000:>8.1f}ms "
+            f"{'yes' if row['same_text'] else 'NO':>8}/{'yes' if row['same_links'] else 'NO'}"
+        )
+    for url, row in report.items():
+        if "error" in row:
+            print(f"{url[:50]:50} error: {row['error']}")
+    if rows:
+        count = len(rows)
+        soup_kb = sum(row["soup"]["bytes"] for _, row in rows) / count / 1024
+        dom_kb = sum(row["dom"]["bytes"] for _, row in rows) / count / 1024
+        saved_ms = sum(row["soup"]["cpu"] - row["dom"]["cpu"] for _, row in rows) / count * 1000
+        print(f"Per page: {soup_kb:.1f} KB -> {dom_kb:.1f} KB transferred, {saved_ms:.1f} ms CPU saved (avg over {count} pages)")
+    print(f"Per-URL results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
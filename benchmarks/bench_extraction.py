@@ -0,0 +1,61 @@
+"""
+Extraction time per page: site profiles vs. the generic lookup.
+
+Runs extract_content over every page of a page archive (see main.py --archive), once with
+the profile selected for the page's host and once forced to the generic profile.
+
+    python benchmarks/bench_extraction.py pages.warc.gz --repeat 5
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from extraction_profiles import GENERIC_PROFILE, profile_for_url
+from page_archive import PageArchive, read_record
+from scraper import extract_content
+
+
+def time_extraction(page_source, url, profile, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_content(page_source, url, profile=profile)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profiled vs. generic extraction")
+    parser.add_argument("archive", help="Page archive written with main.py --archive")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per page; the best time is kept (default: 3)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    archive = PageArchive(args.archive)
+    rows = {}
+    for entry in archive.entries():
+        url = entry["url"]
+        page_source = read_record(archive.path, entry["offset"], entry["length"], entry["codec"])
+        profile = profile_for_url(url)
+        generic = time_extraction(page_source, url, GENERIC_PROFILE, args.repeat)
+        profiled = time_extraction(page_source, url, profile, args.repeat) if profile is not GENERIC_PROFILE else generic
+        row = rows.setdefault(urlparse(url).netloc, {"profile": profile.name, "pages": 0, "generic": 0.0, "profiled": 0.0})
+        row["pages"] += 1
+        row["generic"] += generic
+        row["profiled"] += profiled
+
+    print(f"{'host':40} {'profile':12} {'pages':>5} {'generic ms/page':>16} {'profiled ms/page':>17} {'speedup':>8}")
+    for host, row in sorted(rows.items()):
+        generic_ms = row["generic"] / row["pages"] * 1000
+        profiled_ms = row["profiled"] / row["pages"] * 1000
+        print(f"{host:40} {row['profile']:12} {row['pages']:>5} {generic_ms:>16.2f} {profiled_ms:>17.2f} {generic_ms / profiled_ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Import-time check for the CLI entry point.
+
+Runs `python -X importtime -c "import main"` several times in fresh interpreters, keeps the
+best total, and prints the slowest top-level imports. Exits with status 1 if the total
+exceeds --max-ms or if one of the browser/ML stacks is imported eagerly again, so it can
+guard against startup regressions in CI.
+
+    python benchmarks/bench_import_time.py --max-ms 250
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Only the runs that need them may import these
+LAZY_MODULES = ("selenium.webdriver", "webdriver_manager", "bs4", "numpy")
+
+
+def import_times(module):
+    """
+    Imports the module in a fresh interpreter and parses the -X importtime report.
+    Returns (total us, {direct child: cumulative us}, names of every module imported on the way).
+    Interpreter startup imports (site, encodings) are not counted.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(cumulative_us), depth))
+
+    # Children are reported before their parent, so the module's subtree is everything
+    # between the previous top-level entry and the module itself
+    end = max(i for i, (name, _, depth) in enumerate(entries) if name == module and depth == 0)
+    start = end
+    while start > 0 and entries[start - 1][2] > 0:
+        start -= 1
+    subtree = entries[start:end]
+    children = {name: cumulative for name, cumulative, depth in subtree if depth == 1}
+    return entries[end][1], children, [name for name, _, _ in subtree]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure and guard the import time of main.py")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to run; the best is kept (default: 5)")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the best import time exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports to list (default: 10)")
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(args.repeat):
+        run = import_times(args.module)
+        if best is None or run[0] < best[0]:
+            best = run
+    total, children, imported = best
+
+    print(f"import {args.module}: {total / 1000:.1f} ms (best of {args.repeat})")
+    for name, cumulative in sorted(children.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    failed = False
+    eager = sorted(name for name in imported if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES))
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager[:10])}{' ...' if len(eager) > 10 else ''}")
+        failed = True
+    if args.max_ms is not None and total / 1000 > args.max_ms:
+        print(f"FAIL: {total / 1000:.1f} ms is over the {args.max_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
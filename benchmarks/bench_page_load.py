@@ -0,0 +1,73 @@
+"""
+Per-URL driver.get latency for each Selenium page load strategy.
+
+Every strategy gets its own browser and loads the same URL list; for each URL the time
+spent in driver.get and the time until the DOM is ready (page_load.navigate) are recorded.
+
+    python benchmarks/bench_page_load.py urls.txt --headless --strategies normal eager none
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from page_load import PAGE_LOAD_STRATEGIES, navigate
+from scraper import WebScraper
+
+
+def measure(url, scraper):
+    """Returns (driver.get seconds, seconds until the DOM is ready)."""
+    start = time.perf_counter()
+    get_seconds = navigate(scraper.driver, url, scraper.page_load_strategy)
+    return get_seconds, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare page load strategies on the same URL list")
+    parser.add_argument("urls", help="Text file with one URL per line")
+    parser.add_argument("--strategies", nargs="+", choices=PAGE_LOAD_STRATEGIES, default=list(PAGE_LOAD_STRATEGIES))
+    parser.add_argument("--headless", action="store_true", help="Run browsers in headless mode")
+    parser.add_argument("--output", default="page_load_report.json", help="Where to write per-URL timings (default: page_load_report.json)")
+    args = parser.parse_args()
+
+    with open(args.urls, encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    report = {}
+    for strategy in args.strategies:
+        scraper = WebScraper(headless=args.headless, page_load_strategy=strategy)
+        timings = {}
+        try:
+            for url in urls:
+                try:
+                    get_seconds, ready_seconds = measure(url, scraper)
+                    timings[url] = {"get": get_seconds, "ready": ready_seconds}
+                except Exception as e:
+                    timings[url] = {"error": str(e)}
+        finally:
+            scraper.close()
+        report[strategy] = timings
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+
+    print(f"{'url':60} " + " ".join(f"{s + ' get/ready s':>22}" for s in args.strategies))
+    for url in urls:
+        cells = []
+        for strategy in args.strategies:
+            timing = report[strategy][url]
+            cells.append(f"{'error':>22}" if "error" in timing else f"{timing['get']:>10.2f} / {timing['ready']:<9.2f}")
+        print(f"{url[:60]:60} " + " ".join(cells))
+    for strategy in args.strategies:
+        ready = [t["ready"] for t in report[strategy].values() if "ready" in t]
+        if ready:
+            print(f"{strategy:>8}: median ready {statistics.median(ready):.2f}s over {len(ready)} URLs")
+    print(f"Per-URL timings written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
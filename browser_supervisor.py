@@ -0,0 +1,117 @@
+import logging
+import os
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _proc_tree_rss(pid):
+    """Linux fallback for process_tree_rss without psutil: walks /proc."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..."; comm may contain spaces or parentheses
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except OSError:
+            pass
+    return total
+
+
+def process_tree_rss(pid):
+    """
+    Resident memory in bytes of a process and all its descendants (Chrome's browser,
+    GPU and renderer processes under chromedriver). Shared pages are counted once per
+    process, so this overestimates. Returns None if it cannot be measured.
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            total = 0
+            for process in [root] + root.children(recursive=True):
+                try:
+                    total += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            return total
+        except psutil.NoSuchProcess:
+            return None
+    if os.path.isdir("/proc"):
+        return _proc_tree_rss(pid)
+    return None
+
+
+def driver_pid(driver):
+    """PID of the local chromedriver process (Chrome runs under it), or None."""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return getattr(process, "pid", None)
+
+
+class BrowserSupervisor:
+    """
+    Decides when WebScraper should replace its browser.
+
+    A recycle is due after max_pages pages, once the RSS of the browser's process tree
+    exceeds max_rss_mb (sampled every check_every pages), or after max_timeouts
+    consecutive page load timeouts, which is how a hung renderer shows up.
+    Any limit set to None is not checked.
+    """
+
+    def __init__(self, max_pages=None, max_rss_mb=None, max_timeouts=3, check_every=5):
+        self.logger = logging.getLogger(__name__)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.max_timeouts = max_timeouts
+        self.check_every = check_every
+        self.pages = 0
+        self.consecutive_timeouts = 0
+        self.last_rss_mb = None
+        self.recycles = []
+        if max_rss_mb and psutil is None and not os.path.isdir("/proc"):
+            self.logger.warning("Cannot measure browser memory here (pip install psutil); the RSS limit is ignored.")
+
+    def check(self, driver, timed_out):
+        """Records one page. Returns the reason the browser should be recycled, or None."""
+        self.pages += 1
+        self.consecutive_timeouts = self.consecutive_timeouts + 1 if timed_out else 0
+
+        if self.max_timeouts and self.consecutive_timeouts >= self.max_timeouts:
+            return f"{self.consecutive_timeouts} consecutive page load timeouts"
+        if self.max_pages and self.pages >= self.max_pages:
+            return f"{self.pages} pages served"
+        if self.max_rss_mb and self.pages % self.check_every == 0:
+            pid = driver_pid(driver)
+            rss = process_tree_rss(pid) if pid else None
+            if rss is not None:
+                self.last_rss_mb = rss / (1024 * 1024)
+                if self.last_rss_mb > self.max_rss_mb:
+                    return f"browser RSS {self.last_rss_mb:.0f} MB is over {self.max_rss_mb} MB"
+        return None
+
+    def recycled(self, reason):
+        self.recycles.append(reason)
+        self.pages = 0
+        self.consecutive_timeouts = 0
+        self.last_rss_mb = None
+
+    def log_summary(self):
+        if self.recycles:
+            self.logger.info(f"Browser recycled {len(self.recycles)} times: {'; '.join(self.recycles)}")
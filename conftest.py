@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+from driver_pool import DriverPool
+
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Browsers shared by every test of the session (per worker under pytest-xdist)."""
+    pool = DriverPool(headless=bool(os.environ.get("HEADLESS")))
+    yield pool
+    pool.close()
@@ -0,0 +1,133 @@
+import logging
+import time
+
+
+def _ewma(current, sample, alpha=0.3):
+    return sample if current is None else (1 - alpha) * current + alpha * sample
+
+
+def _duration(seconds):
+    seconds = max(0, int(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class CrawlBudget:
+    """
+    Decides whether the crawl can take another page within its time and token budgets.
+
+    Keeps rolling (EWMA) averages of seconds per scraped page, seconds per summary and
+    tokens per summary. A new page is only admitted if scraping it and draining every
+    outstanding summary (including its own) is still expected to fit in the time budget,
+    and if the projected token spend of those summaries fits in the token budget.
+
+    Until the first summary finishes, its cost is estimated from the queued pages' prompt
+    lengths and its duration is at least the time the oldest queued page has waited.
+    """
+
+    def __init__(self, ollama, workers, time_budget=None, token_budget=None, max_pages=None):
+        self.logger = logging.getLogger(__name__)
+        self.ollama = ollama
+        self.workers = workers
+        self.time_budget = time_budget
+        self.token_budget = token_budget
+        self.max_pages = max_pages
+        self.started = time.time()
+        # The client may be shared with earlier crawls, so only count tokens from here on
+        self.tokens_start = ollama.tokens_used
+        self.scrape_seconds = None
+        self.summary_seconds = None
+        self.estimated_tokens = None
+        self.first_queued = None
+        self.pages_scraped = 0
+        self.summaries_done = 0
+        self.stop_reason = None
+
+    def record_scrape(self, seconds):
+        self.pages_scraped += 1
+        self.scrape_seconds = _ewma(self.scrape_seconds, seconds)
+
+    def record_queued(self, text):
+        """A page was queued for summarizing."""
+        if self.first_queued is None:
+            self.first_queued = time.time()
+        self.estimated_tokens = _ewma(self.estimated_tokens, self.ollama.estimate_summary_tokens(text))
+
+    def record_summary(self, url, seconds):
+        self.summaries_done += 1
+        self.summary_seconds = _ewma(self.summary_seconds, seconds)
+
+    def concurrency(self):
+        if self.ollama.limiter:
+            return max(1, min(self.workers, self.ollama.limiter.limit))
+        return self.workers
+
+    def tokens_used(self):
+        return self.ollama.tokens_used - self.tokens_start
+
+    def tokens_per_summary(self):
+        calls = len(self.ollama.call_stats)
+        return self.ollama.tokens_used / calls if calls else self.estimated_tokens
+
+    def _seconds_per_summary(self):
+        if self.summary_seconds is not None:
+            return self.summary_seconds
+        if self.first_queued is not None:
+            # None finished yet, so the first one takes at least as long as it has been queued
+            return time.time() - self.first_queued
+        return 0.0
+
+    def _drain_seconds(self, outstanding):
+        """Expected time to finish `outstanding` summaries with the current concurrency."""
+        return outstanding * self._seconds_per_summary() / self.concurrency()
+
+    def can_admit(self, outstanding):
+        """
+        True if one more page fits in the budgets, given the number of summaries
+        already queued or running. Sets stop_reason when it returns False.
+        """
+        if self.time_budget is not None:
+            elapsed = time.time() - self.started
+            projected = elapsed + (self.scrape_seconds or 0.0) + self._drain_seconds(outstanding + 1)
+            if projected > self.time_budget:
+                self.stop_reason = (
+                    f"time budget: {_duration(elapsed)} elapsed, one more page would finish at "
+                    f"~{_duration(projected)} of {_duration(self.time_budget)}"
+                )
+                return False
+
+        if self.token_budget is not None:
+            per_summary = self.tokens_per_summary() or 0.0
+            projected = self.tokens_used() + (outstanding + 1) * per_summary
+            if projected > self.token_budget:
+                self.stop_reason = (
+                    f"token budget: {self.tokens_used()} used, {outstanding} summaries outstanding "
+                    f"at ~{per_summary:.0f} tokens each would exceed {self.token_budget}"
+                )
+                return False
+        return True
+
+    def status_line(self, outstanding, queued_urls):
+        """One-line progress report with throughput and ETA."""
+        elapsed = time.time() - self.started
+        minutes = max(elapsed / 60, 1e-9)
+        remaining = queued_urls if self.max_pages is None else min(queued_urls, self.max_pages - self.pages_scraped)
+        scrape_left = remaining * (self.scrape_seconds or 0.0)
+        eta = max(scrape_left, self._drain_seconds(outstanding + remaining))
+        if self.time_budget is not None:
+            eta = min(eta, max(0.0, self.time_budget - elapsed))
+
+        line = (
+            f"{self.pages_scraped} pages ({self.pages_scraped / minutes:.1f}/min), "
+            f"{self.summaries_done} summaries ({self.summaries_done / minutes:.1f}/min), "
+            f"{outstanding} outstanding, {self.tokens_used()} tokens, "
+            f"elapsed {_duration(elapsed)}, ETA {_duration(eta)}"
+        )
+        if self.time_budget is not None:
+            line += f", time left {_duration(self.time_budget - elapsed)}"
+        if self.token_budget is not None:
+            line += f", tokens left {self.token_budget - self.tokens_used()}"
+        return line
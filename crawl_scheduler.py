@@ -0,0 +1,212 @@
+import logging
+import time
+from urllib import robotparser
+from urllib.parse import urlparse
+
+import requests
+
+from link_graph import Frontier
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+
+class HostState:
+    """Queue, politeness limits and counters of one host."""
+
+    def __init__(self, host, graph, rate, burst, max_concurrency):
+        self.host = host
+        self.frontier = Frontier(graph)
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.fetched = 0
+        self.last_served = 0.0
+
+    def wait_time(self):
+        if not self.frontier or self.in_flight >= self.max_concurrency:
+            return None
+        return self.bucket.wait_time()
+
+
+class HostScheduler:
+    """
+    Crawl frontier spanning several hosts, with per-host politeness.
+
+    Every host has its own queue, a token bucket (host_rate requests per second, bursts
+    of `burst`, slowed down to the robots.txt Crawl-delay when one is set) and a cap on
+    requests in flight. pop() hands out a URL from a host that is allowed to be fetched
+    right now, picking the most important head URL (then the host served longest ago),
+    so one slow-paced host never stalls the others; it only sleeps when no host is ready.
+
+    Has the same push/pop/rerank/len interface as Frontier; pop() must be paired with
+    release() once the page has been fetched (releasing twice is harmless). reserve()
+    charges a URL to its host ahead of time (for prefetching); the next pop() returns it. robots_cache (host -> Crawl-delay) can be
+    shared between schedulers so robots.txt is fetched once per process.
+    """
+
+    def __init__(self, graph=None, host_rate=1.0, burst=1, max_concurrency=1, crawl_delay=True, robots_timeout=10,
+                 robots_cache=None):
+        self.logger = logging.getLogger(__name__)
+        self.graph = graph
+        self.host_rate = host_rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.crawl_delay = crawl_delay
+        self.robots_timeout = robots_timeout
+        self.robots_cache = robots_cache if robots_cache is not None else {}
+        self.hosts = {}
+        self.in_flight_urls = set()
+        self.reserved = {}
+        self.waited = 0.0
+
+    def _robots_delay(self, url):
+        """Crawl-delay from the host's robots.txt, or None."""
+        parsed = urlparse(url)
+        try:
+            response = requests.get(f"{parsed.scheme}://{parsed.netloc}/robots.txt", timeout=(5, self.robots_timeout))
+            if response.status_code != 200:
+                return None
+            parser = robotparser.RobotFileParser()
+            parser.parse(response.text.splitlines())
+            parser.modified()  # crawl_delay() ignores rules that were never marked as fetched
+            return parser.crawl_delay("*")
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Could not read robots.txt of {parsed.netloc}: {e}")
+            return None
+
+    def _host(self, url):
+        host = urlparse(url).netloc
+        state = self.hosts.get(host)
+        if state is None:
+            rate, burst = self.host_rate, self.burst
+            delay = None
+            if self.crawl_delay:
+                if host not in self.robots_cache:
+                    self.robots_cache[host] = self._robots_delay(url)
+                delay = self.robots_cache[host]
+            if delay:
+                rate, burst = min(rate, 1.0 / float(delay)), 1
+                self.logger.info(f"{host}: robots.txt Crawl-delay {delay}s, limiting to {rate:.2f} pages/s")
+            state = HostState(host, self.graph, rate, burst, self.max_concurrency)
+            self.hosts[host] = state
+        return state
+
+    def push(self, url):
+        self._host(url).frontier.push(url)
+
+    def _pick(self):
+        """Returns (host ready now or None, seconds until the next host is ready or None)."""
+        ready, next_wait = [], None
+        for state in self.hosts.values():
+            wait = state.wait_time()
+            if wait is None:
+                continue
+            if wait == 0:
+                ready.append(state)
+            elif next_wait is None or wait < next_wait:
+                next_wait = wait
+        if not ready:
+            return None, next_wait
+        score = self.graph.score if self.graph is not None else (lambda url: 0.0)
+        return max(ready, key=lambda state: (score(state.frontier.peek()), -state.last_served)), 0.0
+
+    def pop(self):
+        """
+        Returns the next URL to fetch, sleeping until some host is allowed to be fetched.
+        Returns None when nothing can be fetched (all queues empty or all hosts at their cap).
+        """
+        if self.reserved:
+            # Already charged to its host by reserve()
+            url, _ = self.reserved.popitem()
+            return url
+        while True:
+            state, wait = self._pick()
+            if state:
+                url = state.frontier.pop()
+                self._charge(state, url)
+                return url
+            if wait is None:
+                return None
+            self.waited += wait
+            time.sleep(wait)
+
+    def _charge(self, state, url):
+        state.bucket.take()
+        state.in_flight += 1
+        state.fetched += 1
+        state.last_served = time.monotonic()
+        self.in_flight_urls.add(url)
+
+    def peek(self):
+        """The URL pop() would most likely return next, without waiting or taking it."""
+        if self.reserved:
+            return next(iter(self.reserved))
+        state, _ = self._pick()
+        if state is None:
+            waiting = [(state.bucket.wait_time(), state) for state in self.hosts.values() if state.frontier]
+            if not waiting:
+                return None
+            state = min(waiting, key=lambda item: item[0])[1]
+        return state.frontier.peek()
+
+    def reserve(self, url):
+        """
+        If url's host may be fetched right now, takes its token and concurrency slot as
+        pop() would, removes url from the queue and returns True; the next pop() then
+        returns url. Returns False (and changes nothing) if the host is held back or url
+        is not queued.
+        """
+        state = self.hosts.get(urlparse(url).netloc)
+        if state is None or url in self.reserved or state.wait_time() != 0:
+            return False
+        if not state.frontier.remove(url):
+            return False
+        self._charge(state, url)
+        self.reserved[url] = state
+        return True
+
+    def release(self, url):
+        """Marks a URL handed out by pop() as fetched."""
+        if url not in self.in_flight_urls:
+            return
+        self.in_flight_urls.discard(url)
+        state = self.hosts.get(urlparse(url).netloc)
+        if state and state.in_flight > 0:
+            state.in_flight -= 1
+
+    def rerank(self):
+        for state in self.hosts.values():
+            state.frontier.rerank()
+
+    def __len__(self):
+        return len(self.reserved) + sum(len(state.frontier) for state in self.hosts.values())
+
+    def log_stats(self):
+        for state in self.hosts.values():
+            self.logger.info(
+                f"Host {state.host}: {state.fetched} pages fetched at up to {state.bucket.rate:.2f}/s, "
+                f"{len(state.frontier)} still queued"
+            )
+        self.logger.info(f"Scheduler waited {self.waited:.1f}s in total for politeness limits")
@@ -0,0 +1,84 @@
+# soup: transfer driver.page_source and parse it with BeautifulSoup (extract_content)
+# dom:  run the same walk inside the page and transfer only the text and hrefs
+EXTRACT_MODES = ("soup", "dom")
+
+# Mirrors scraper.extract_content on a clone of the live DOM, so the page itself is not modified
+_EXTRACT_SCRIPT = r"""
+const cfg = arguments[0];
+const doc = document.documentElement.cloneNode(true);
+const drop = (root, selector) => root.querySelectorAll(selector).forEach(el => el.remove());
+const textOf = (el) => {
+    const parts = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    let node;
+    while ((node = walker.nextNode())) {
+        const text = node.nodeValue.trim();
+        if (text) parts.push(text);
+    }
+    return parts.join(' ');
+};
+
+drop(doc, 'script, style, nav, footer, header, noscript');
+
+let root = null;
+for (const selector of cfg.contentRoot) {
+    root = doc.querySelector(selector);
+    if (root) break;
+}
+if (!root) {
+    root = doc.querySelector('#mw-content-text') || doc.querySelector('main') ||
+           doc.querySelector('article') || doc.querySelector('body');
+} else if (cfg.exclude) {
+    drop(root, cfg.exclude);
+}
+
+const escape = (s) => s.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+const stop = cfg.stopKeywords.length ? new RegExp(cfg.stopKeywords.map(escape).join('|'), 'i') : null;
+const parts = [];
+const skipped = [];
+let headers = 0, chars = 0, truncated = false, stoppedAt = null;
+if (root) {
+    for (const el of root.querySelectorAll('h1, h2, h3, p')) {
+        const text = textOf(el);
+        if (el.tagName !== 'P') {
+            if (stop && stop.test(text)) {
+                if (cfg.stopAction === 'break') { stoppedAt = text; break; }
+                skipped.push(text);
+                continue;
+            }
+            headers++;
+        }
+        if (text) { parts.push(text); chars += text.length; }
+        if (headers >= cfg.maxSections || chars > cfg.maxChars) { truncated = true; break; }
+    }
+}
+
+const hrefs = new Set();
+doc.querySelectorAll('a[href]').forEach(a => hrefs.add(a.getAttribute('href')));
+return {
+    text: parts.length ? parts.join(' ') : textOf(doc),
+    hrefs: Array.from(hrefs),
+    headers: headers, chars: chars, truncated: truncated, stoppedAt: stoppedAt, skipped: skipped
+};
+"""
+
+
+def extract_in_browser(driver, url=None, profile=None):
+    """
+    Runs the extract_content walk (noise removal, content root, header/paragraph walk,
+    stop keywords, section and character caps) inside the loaded page with one
+    execute_script call. Only the text and the raw hrefs come back over the wire.
+    Returns the script's result dict: text, hrefs, headers, chars, truncated, stoppedAt, skipped.
+    """
+    if profile is None:
+        from extraction_profiles import profile_for_url  # keeps this module light for main.py's argparse
+        profile = profile_for_url(url)
+    config = {
+        "contentRoot": profile.content_root_selectors,
+        "exclude": profile.exclude_selector,
+        "stopKeywords": profile.stop_keywords,
+        "stopAction": profile.stop_action,
+        "maxSections": profile.max_sections,
+        "maxChars": profile.max_chars,
+    }
+    return driver.execute_script(_EXTRACT_SCRIPT, config)
@@ -0,0 +1,93 @@
+import logging
+
+from selenium import webdriver
+
+
+def chrome_options(headless=False):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-search-engine-choice-screen")
+    return options
+
+
+def edge_options(headless=False):
+    options = webdriver.EdgeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--start-maximized")
+    return options
+
+
+class DriverPool:
+    """
+    Keeps already-running browsers around so tests do not pay for a browser launch each.
+
+    acquire() hands out an idle browser (or starts one); release() resets it cheaply
+    (extra windows closed, cookies and storage cleared via CDP, blank page) and puts it
+    back. A browser whose reset fails is quit, and the next acquire() starts a fresh one.
+    """
+
+    FACTORIES = {
+        "chrome": lambda headless: webdriver.Chrome(options=chrome_options(headless)),
+        "edge": lambda headless: webdriver.Edge(options=edge_options(headless)),
+    }
+
+    def __init__(self, headless=False, max_idle=4):
+        self.logger = logging.getLogger(__name__)
+        self.headless = headless
+        self.max_idle = max_idle
+        self.idle = {browser: [] for browser in self.FACTORIES}
+        self.launched = 0
+        self.reused = 0
+
+    def acquire(self, browser="chrome"):
+        if self.idle[browser]:
+            self.reused += 1
+            return self.idle[browser].pop()
+        self.launched += 1
+        self.logger.info(f"Starting a new {browser} browser for the pool")
+        return self.FACTORIES[browser](self.headless)
+
+    def release(self, driver, browser="chrome"):
+        if len(self.idle[browser]) < self.max_idle and self.reset(driver):
+            self.idle[browser].append(driver)
+        else:
+            self._quit(driver)
+
+    def reset(self, driver):
+        """Returns the browser to a clean state. Returns False if that was not possible."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            origin = driver.execute_script("return window.location.origin")
+            if hasattr(driver, "execute_cdp_cmd"):
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                if origin and origin != "null":
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            else:
+                driver.delete_all_cookies()
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Browser reset failed, it will be replaced: {e}")
+            return False
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error quitting browser: {e}")
+
+    def close(self):
+        for drivers in self.idle.values():
+            for driver in drivers:
+                self._quit(driver)
+            drivers.clear()
+        self.logger.info(f"Driver pool closed: {self.launched} browsers launched, {self.reused} reuses")
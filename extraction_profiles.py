@@ -0,0 +1,99 @@
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import soupsieve
+
+DEFAULT_STOP_KEYWORDS = ["exercise", "problem", "quiz", "question", "reference", "bibliography", "external link"]
+
+
+class ExtractionProfile:
+    """
+    How to pull the article text out of pages of one site.
+
+    content_root   CSS selectors tried in order to find the article subtree. If none match,
+                   the generic Wikipedia/main/article/body lookup is used.
+    exclude        CSS selectors removed from the article subtree before walking it.
+    stop_keywords  Header keywords that mark a section to skip ("skip") or the end of the
+                   article ("break"), depending on stop_action.
+    max_sections   Stop after this many headers.
+    max_chars      Stop after this many characters.
+
+    Selectors and keywords are compiled once, when the profile is created.
+    """
+
+    def __init__(self, name, content_root=(), exclude=(), stop_keywords=DEFAULT_STOP_KEYWORDS,
+                 stop_action="skip", max_sections=3, max_chars=15000):
+        if stop_action not in ("skip", "break"):
+            raise ValueError(f"Unknown stop action: {stop_action}")
+        self.name = name
+        # Source selectors and keywords are kept for the in-browser extractor (dom_extraction.py)
+        self.content_root_selectors = list(content_root)
+        self.exclude_selector = ", ".join(exclude)
+        self.stop_keywords = list(stop_keywords or [])
+        self.content_root = [soupsieve.compile(selector) for selector in content_root]
+        self.exclude = soupsieve.compile(", ".join(exclude)) if exclude else None
+        self.stop_pattern = re.compile("|".join(re.escape(k) for k in stop_keywords), re.IGNORECASE) if stop_keywords else None
+        self.stop_action = stop_action
+        self.max_sections = max_sections
+        self.max_chars = max_chars
+
+    def find_root(self, soup):
+        for selector in self.content_root:
+            root = selector.select_one(soup)
+            if root is not None:
+                return root
+        return None
+
+    def is_stop_header(self, text):
+        return bool(self.stop_pattern and self.stop_pattern.search(text))
+
+
+# The generic profile reproduces the original hardcoded behaviour
+GENERIC_PROFILE = ExtractionProfile("generic")
+
+# Keyed by host without "www."; a key also matches its subdomains (e.g. "wikipedia.org").
+PROFILES = {
+    "wikipedia.org": ExtractionProfile(
+        "wikipedia",
+        content_root=["#mw-content-text"],
+        exclude=[".mw-editsection", ".navbox", ".reflist", ".hatnote", ".mw-references-wrap"],
+        stop_keywords=DEFAULT_STOP_KEYWORDS + ["see also", "notes", "further reading"],
+        stop_action="break",
+    ),
+    "english.mathrubhumi.com": ExtractionProfile(
+        "mathrubhumi",
+        content_root=["article", ".article-body", "main"],
+        exclude=["aside", "figure", "figcaption", "[class*='related']", "[class*='share']", "[class*='advert']"],
+        stop_keywords=["also read", "related", "trending", "latest news"],
+        stop_action="break",
+        max_sections=4,
+    ),
+    "w3schools.com": ExtractionProfile(
+        "w3schools",
+        content_root=["#main"],
+        exclude=["#mainLeaderboard", ".nextprev", "#user-profile-bottom-wrapper", ".w3-example"],
+        stop_keywords=DEFAULT_STOP_KEYWORDS + ["exercises", "video"],
+        stop_action="break",
+    ),
+}
+
+
+@lru_cache(maxsize=256)
+def profile_for_host(host):
+    """Returns the profile registered for the host (or a parent domain), else the generic one."""
+    host = host.lower().split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    parts = host.split(".")
+    for i in range(len(parts) - 1):
+        profile = PROFILES.get(".".join(parts[i:]))
+        if profile:
+            return profile
+    return GENERIC_PROFILE
+
+
+def profile_for_url(url):
+    if not url:
+        return GENERIC_PROFILE
+    return profile_for_host(urlparse(url).netloc)
@@ -0,0 +1,87 @@
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# browser: load every link in Chrome
+# http:    check every link with a streamed GET first and only load the doubtful ones in Chrome
+CHECK_MODES = ("browser", "http")
+
+_TITLE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+# Pages that tell the visitor to enable JavaScript only render their content in a browser
+_NEEDS_JS = re.compile(rb"enable javascript|requires javascript|javascript is (disabled|required)", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+def _session(workers):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0 (compatible; menu-link-checker)"
+    return session
+
+
+def check_link(session, url, timeout=10, max_bytes=65536):
+    """
+    GETs the URL with a streamed body and reads only until </title> (at most max_bytes).
+    Returns a dict with url, status, title, seconds and `escalate`: the reason the link
+    should still be loaded in a browser (request failed, error status, HTML without a
+    title or asking for JavaScript), or None if the HTTP check is conclusive.
+    """
+    result = {"url": url, "status": None, "title": None, "seconds": None, "escalate": None}
+    start = time.perf_counter()
+    try:
+        with session.get(url, stream=True, timeout=(5, timeout), allow_redirects=True) as response:
+            result["status"] = response.status_code
+            if response.status_code >= 400:
+                result["escalate"] = f"HTTP {response.status_code}"
+            elif "html" in response.headers.get("Content-Type", "html"):
+                head = b""
+                for chunk in response.iter_content(chunk_size=8192):
+                    head += chunk
+                    if b"</title>" in head.lower() or len(head) >= max_bytes:
+                        break
+                match = _TITLE.search(head)
+                if match:
+                    result["title"] = " ".join(match.group(1).decode(response.encoding or "utf-8", "replace").split())
+                if _NEEDS_JS.search(head):
+                    result["escalate"] = "page asks for JavaScript"
+                elif not result["title"]:
+                    result["escalate"] = "no <title> in the HTML (probably rendered by JavaScript)"
+    except requests.exceptions.RequestException as e:
+        result["escalate"] = f"request failed: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def check_links(urls, workers=16, timeout=10, max_bytes=65536):
+    """
+    Checks all URLs concurrently over one pooled session. Returns the results of
+    check_link in the order of `urls`.
+    """
+    if not urls:
+        return []
+    start = time.perf_counter()
+    session = _session(workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="link-check") as pool:
+            results = list(pool.map(lambda url: check_link(session, url, timeout, max_bytes), urls))
+    finally:
+        session.close()
+
+    for result in results:
+        if result["escalate"]:
+            logger.info(f"Needs the browser: {result['url']} ({result['escalate']})")
+        else:
+            logger.info(f"OK {result['status']} in {result['seconds']:.2f}s: {result['url']} - {result['title'] or 'no title'}")
+    escalated = sum(1 for result in results if result["escalate"])
+    logger.info(
+        f"Checked {len(results)} links over HTTP in {time.perf_counter() - start:.2f}s: "
+        f"{len(results) - escalated} ok, {escalated} left for the browser"
+    )
+    return results
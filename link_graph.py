@@ -0,0 +1,151 @@
+import heapq
+import itertools
+import json
+import logging
+from array import array
+
+
+class LinkGraph:
+    """
+    In-memory link graph of the crawled site.
+
+    URLs are mapped to compact int IDs and edges are kept in two parallel int arrays
+    (source, target), so the graph stays small even with thousands of links.
+    PageRank is updated incrementally: every update starts from the previous scores
+    and runs only a few power iterations.
+    """
+
+    def __init__(self, damping=0.85):
+        self.logger = logging.getLogger(__name__)
+        self.damping = damping
+        self.ids = {}
+        self.urls = []
+        self.src = array("i")
+        self.dst = array("i")
+        self.out_degree = array("i")
+        self.in_degree = array("i")
+        self.scores = array("d")
+
+    def node_id(self, url):
+        node = self.ids.get(url)
+        if node is None:
+            node = len(self.urls)
+            self.ids[url] = node
+            self.urls.append(url)
+            self.out_degree.append(0)
+            self.in_degree.append(0)
+            self.scores.append(0.0)
+        return node
+
+    def add_links(self, source_url, target_urls):
+        """Records the (already deduplicated) links found on source_url."""
+        source = self.node_id(source_url)
+        for url in target_urls:
+            target = self.node_id(url)
+            if target == source:
+                continue
+            self.src.append(source)
+            self.dst.append(target)
+            self.out_degree[source] += 1
+            self.in_degree[target] += 1
+
+    def update_pagerank(self, iterations=3, tolerance=1e-6):
+        """Runs a few warm-started power iterations over the current graph."""
+        n = len(self.urls)
+        if not n:
+            return
+        total = sum(self.scores)
+        if total <= 0:
+            scores = [1.0 / n] * n
+        else:
+            # New nodes start from the uniform share; renormalize so scores sum to 1
+            scores = [(s if s > 0 else 1.0 / n) for s in self.scores]
+            total = sum(scores)
+            scores = [s / total for s in scores]
+
+        d = self.damping
+        src, dst, out_degree = self.src, self.dst, self.out_degree
+        for _ in range(iterations):
+            dangling = sum(scores[i] for i in range(n) if out_degree[i] == 0)
+            base = (1.0 - d) / n + d * dangling / n
+            new_scores = [base] * n
+            for i in range(len(src)):
+                s = src[i]
+                new_scores[dst[i]] += d * scores[s] / out_degree[s]
+            delta = sum(abs(a - b) for a, b in zip(new_scores, scores))
+            scores = new_scores
+            if delta < tolerance:
+                break
+        self.scores = array("d", scores)
+
+    def score(self, url):
+        node = self.ids.get(url)
+        return self.scores[node] if node is not None else 0.0
+
+    def export(self, path):
+        """Writes nodes (with scores and degrees) and the edge list as JSON."""
+        graph = {
+            "nodes": [
+                {"id": i, "url": url, "pagerank": self.scores[i],
+                 "in_degree": self.in_degree[i], "out_degree": self.out_degree[i]}
+                for i, url in enumerate(self.urls)
+            ],
+            "edges": [[s, t] for s, t in zip(self.src, self.dst)],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(graph, f)
+        self.logger.info(f"Link graph ({len(self.urls)} nodes, {len(self.src)} edges) saved to {path}")
+
+
+class Frontier:
+    """
+    URLs waiting to be crawled. With a LinkGraph the most important URL (highest
+    PageRank, then in-degree) is popped first; without one it behaves as a FIFO queue.
+    """
+
+    def __init__(self, graph=None):
+        self.graph = graph
+        self._heap = []
+        self._queued = set()
+        self._seq = itertools.count()
+
+    def _key(self, url):
+        if self.graph is None:
+            return (0.0, 0)
+        node = self.graph.ids.get(url)
+        if node is None:
+            return (0.0, 0)
+        return (-self.graph.scores[node], -self.graph.in_degree[node])
+
+    def push(self, url):
+        if url in self._queued:
+            return
+        self._queued.add(url)
+        heapq.heappush(self._heap, (self._key(url), next(self._seq), url))
+
+    def pop(self):
+        _, _, url = heapq.heappop(self._heap)
+        self._queued.discard(url)
+        return url
+
+    def peek(self):
+        return self._heap[0][2] if self._heap else None
+
+    def remove(self, url):
+        """Takes a queued URL out of the queue, wherever it is. Returns False if it was not queued."""
+        if url not in self._queued:
+            return False
+        self._queued.discard(url)
+        self._heap = [entry for entry in self._heap if entry[2] != url]
+        heapq.heapify(self._heap)
+        return True
+
+    def rerank(self):
+        """Re-sorts the queue after the graph's scores changed."""
+        if self.graph is None:
+            return
+        self._heap = [(self._key(url), seq, url) for _, seq, url in self._heap]
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,98 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FORMATS = ("text", "json")
+
+# Fields callers can attach with extra={...} to make an event structured
+EVENT_FIELDS = ("url", "stage", "duration")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, thread, message and any event fields."""
+
+    def format(self, record):
+        event = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for field in EVENT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                event[field] = round(value, 4) if isinstance(value, float) else value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            event["exc"] = record.exc_text
+        return json.dumps(event, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of the INFO/DEBUG records of the configured loggers
+    (e.g. {"summary_pipeline": 0.1} keeps every 10th). Warnings and errors always pass.
+    Sampling is by count, not random, so the kept records are evenly spaced.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+        self.seen = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.name)
+        if rate is None:
+            return True
+        count = self.seen.get(record.name, 0) + 1
+        self.seen[record.name] = count
+        return int(count * rate) != int((count - 1) * rate)
+
+
+def sample_rate(value):
+    """argparse type for --log-sample: LOGGER=RATE with RATE in [0, 1]."""
+    name, _, rate = value.partition("=")
+    rate = float(rate)
+    if not name or not 0 <= rate <= 1:
+        raise ValueError(f"Expected LOGGER=RATE with RATE between 0 and 1, got {value}")
+    return name, rate
+
+
+def setup_logging(log_file="scraper.log", log_format="text", level=logging.INFO,
+                  max_bytes=10 * 1024 * 1024, backups=3, sample_rates=None):
+    """
+    Routes all logging through a queue: callers only enqueue the record, and a
+    QueueListener thread does the formatting and the file/terminal I/O.
+    The log file is rotated at max_bytes, keeping `backups` old files.
+    Returns the listener (already started, stopped at exit).
+    """
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(dict(sample_rates)))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
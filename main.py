@@ -2,21 +2,27 @@ import argparse
 import json
 import logging
 import os
+import sqlite3
+import sys
 import time
+from pathlib import Path
 from urllib.parse import urlparse
 
-from ollama_client import OllamaClient
-from scraper import WebScraper
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("scraper.log"),
-        logging.StreamHandler()
-    ]
-)
+from adaptive_limiter import AdaptiveLimiter
+from browser_supervisor import BrowserSupervisor
+from crawl_budget import CrawlBudget
+from crawl_scheduler import HostScheduler
+from dom_extraction import EXTRACT_MODES
+from link_graph import LinkGraph
+from log_setup import LOG_FORMATS, sample_rate, setup_logging
+from ollama_client import PROMPT_MODES, ROUTING_POLICIES, SUMMARY_STOP, ModelRoute, OllamaClient
+from page_archive import CODECS, PageArchive
+from page_load import PAGE_LOAD_STRATEGIES
+from report_store import ReportStore, list_runs, merge, search
+from run_profiler import PROFILE_MODES, RunProfiler
+from site_digest import SiteDigest
+from summary_pipeline import SummaryPipeline
+
 logger = logging.getLogger("Main")
 
 MAX_PAGES = 10
@@ -40,91 +46,595 @@ def is_valid_url(url, base_domain):
     except:
         return False
 
-def main():
-    parser = argparse.ArgumentParser(description="Recursive Selenium Web Scraper with Ollama Summarization")
-    parser.add_argument("--url", type=str, required=True, help="Base URL to start scraping from")
-    parser.add_argument("--model", type=str, default="mistral", help="Ollama model to use (default: mistral)")
-    parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
-    parser.add_argument("--depth", type=int, default=10, help="Max unique pages to visit (default: 10)")
-    
-    args = parser.parse_args()
-    
-    start_url = args.url
-    base_domain = urlparse(start_url).netloc
-    
-    # Initialize components
-    ollama = OllamaClient(model=args.model)
+def hedge_delay(value):
+    """argparse type for --hedge-after: a number of seconds or 'auto'."""
+    return value if value == "auto" else float(value)
+
+def save_results(results, output_file="summary_report.json", txt_output_file="summary_report.txt"):
+    """
+    Writes the url -> summary mapping as JSON and as a readable TXT report.
+    """
+    with open(output_file, "w", encoding='utf-8') as f:
+        json.dump(results, f, indent=4)
+
+    # Save results as TXT
+    with open(txt_output_file, "w", encoding='utf-8') as f:
+         for url, summary in results.items():
+            f.write(f"URL: {url}\n")
+            f.write(f"SUMMARY:\n{summary}\n")
+            f.write("-" * 80 + "\n\n")
+
+def model_routes(args):
+    """
+    Summary tiers: pages up to --small-max-chars go to --small-model (if given),
+    everything else to --model, each with its own output token cap.
+    """
+    stop = args.stop if args.stop is not None else SUMMARY_STOP
+    routes = [ModelRoute("large", args.model, num_predict=args.num_predict or None, stop=stop)]
+    if args.small_model:
+        routes.append(ModelRoute("small", args.small_model, max_chars=args.small_max_chars,
+                                 num_predict=args.small_num_predict or None, stop=stop))
+    return routes
+
+def build_ollama_client(args):
+    """
+    Creates the OllamaClient for the configured endpoint(s) and checks that it is reachable.
+    Returns None if no endpoint responds.
+    """
+    endpoints = args.ollama_url or ["http://localhost:11434"]
+    limiter = None
+    if args.adaptive_concurrency:
+        limiter = AdaptiveLimiter(initial=len(endpoints), max_limit=summary_workers(args, len(endpoints)))
+    ollama = OllamaClient(
+        base_url=endpoints, model=args.model, routing=args.routing, limiter=limiter, prompt_mode=args.prompt_mode,
+        connect_timeout=args.connect_timeout, read_timeout=args.read_timeout, max_retries=args.max_retries,
+        hedge_after=args.hedge_after, breaker_threshold=args.breaker_threshold, breaker_reset=args.breaker_reset,
+        routes=model_routes(args)
+    )
     if not ollama.check_connection():
         logger.critical("Ollama is not accessible. Please ensure 'ollama serve' is running.")
+        return None
+    return ollama
+
+def report_llm_metrics(args, ollama):
+    """Logs the client's latency/throughput metrics and optionally dumps per-call stats."""
+    ollama.log_metrics()
+    if args.llm_stats:
+        with open(args.llm_stats, "w", encoding='utf-8') as f:
+            json.dump(ollama.call_stats, f, indent=4)
+        logger.info(f"Per-call LLM stats saved to {args.llm_stats}")
+
+def write_site_summary(args, ollama, results):
+    """
+    Reduces the per-page summaries to section and site summaries and saves them as JSON.
+    Calls already made for unchanged pages in an earlier run are reused from the cache
+    next to the output file.
+    """
+    workers = summary_workers(args, len(ollama.endpoints))
+    digest = SiteDigest(ollama, workers=workers, context_chars=args.digest_context, cache_path=args.site_summary + ".cache")
+    try:
+        summary = digest.build(results)
+    except Exception as e:
+        logger.error(f"Site summary failed: {e}")
         return
+    with open(args.site_summary, "w", encoding='utf-8') as f:
+        json.dump(summary, f, indent=4)
+    logger.info(f"Site summary saved to {args.site_summary}")
 
-    scraper = WebScraper(headless=args.headless)
+def summary_workers(args, endpoint_count):
+    """
+    Number of summary worker threads. Without the adaptive limiter this is the
+    concurrency (one in-flight summary per endpoint by default); with it, it is the
+    ceiling the limiter may grow to.
+    """
+    if args.summary_workers:
+        return args.summary_workers
+    return 8 * endpoint_count if args.adaptive_concurrency else endpoint_count
+
+def browser_supervisor(args):
+    """Recycling limits for the crawl browser; 0 disables a limit."""
+    return BrowserSupervisor(max_pages=args.recycle_pages or None, max_rss_mb=args.recycle_rss_mb or None,
+                             max_timeouts=args.recycle_timeouts or None)
+
+def topic_clusters(args):
+    """Topic clustering for --cluster (imports numpy), or None."""
+    if args.cluster is None:
+        return None
+    from topic_clusters import TopicClusters
+    return TopicClusters(args.cluster)
+
+def replay(args):
+    """
+    Re-runs extraction (and optionally summarization) over an archived crawl.
+    No browser is started.
+    """
+    archive = PageArchive(args.replay)
+    ollama = None
+    if args.replay_summarize:
+        ollama = build_ollama_client(args)
+        if not ollama:
+            return
+
+    results = {}
+    clusters = topic_clusters(args) if ollama else None
+    pipeline = SummaryPipeline(ollama, results, workers=summary_workers(args, len(ollama.endpoints)),
+                               clusters=clusters, embed_model=args.embed_model) if ollama else None
+    start = time.time()
+    for url, text_content, links in archive.replay(workers=args.workers):
+        if not text_content:
+            results[url] = "Error: Could not extract content."
+        elif pipeline:
+            pipeline.submit(url, text_content)
+        else:
+            results[url] = text_content
+    if pipeline:
+        pipeline.close()
+    if clusters:
+        clusters.attach_summaries(results)
+        clusters.log_summary()
+    logger.info(f"Replayed {len(results)} pages in {time.time() - start:.2f}s")
+
+    if ollama:
+        if args.site_summary:
+            write_site_summary(args, ollama, results)
+        report_llm_metrics(args, ollama)
+        save_results(results)
+        logger.info("Results saved to summary_report.json")
+    else:
+        output_file = "replay_extraction.json"
+        with open(output_file, "w", encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+        logger.info(f"Extracted text saved to {output_file}")
+
+def summarize_local(args):
+    """
+    Summarizes local files (--file) and/or text piped on stdin (--stdin). No browser is
+    started; HTML input goes through the same extraction as crawled pages.
+    """
+    documents = []
+    for path in args.file or []:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            documents.append((Path(path).resolve().as_uri(), f.read()))
+    if args.stdin:
+        documents.append(("stdin", sys.stdin.read()))
+
+    ollama = build_ollama_client(args)
+    if not ollama:
+        return
+
+    results = {}
+    clusters = topic_clusters(args)
+    pipeline = SummaryPipeline(ollama, results, workers=summary_workers(args, len(ollama.endpoints)),
+                               clusters=clusters, embed_model=args.embed_model)
+    for name, content in documents:
+        text_content = content
+        if content.lstrip().startswith("<"):
+            from scraper import extract_content
+            text_content, _ = extract_content(content)
+        if not text_content or not text_content.strip():
+            results[name] = "Error: Could not extract content."
+        else:
+            pipeline.submit(name, text_content)
+    pipeline.close()
+    if clusters:
+        clusters.attach_summaries(results)
+        clusters.log_summary()
+
+    if args.site_summary:
+        write_site_summary(args, ollama, results)
+    report_llm_metrics(args, ollama)
+    save_results(results)
+    logger.info("Results saved to summary_report.json")
+    for name, summary in results.items():
+        print(f"\nURL: {name}")
+        print(f"Summary: {summary}")
+
+def crawl(args, ollama, scraper, output_file="summary_report.json", txt_output_file="summary_report.txt", robots_cache=None):
+    """
+    Crawls from args.url with an already running browser and Ollama client, summarizes the
+    pages and saves the report. Returns (results, stats) where stats has the page and
+    summary counts, wall-clock seconds and whether the crawl was interrupted.
+    """
+    start_urls = args.url
+    # Links are followed within any of the seed domains
+    domains = [urlparse(url).netloc for url in start_urls]
+    
+    clusters = topic_clusters(args)
     
     visited_urls = set()
-    urls_to_visit = [start_url]
+    graph = LinkGraph()
+    urls_to_visit = HostScheduler(
+        graph if args.order == "importance" else None, host_rate=args.host_rate, burst=args.host_burst,
+        max_concurrency=args.host_concurrency, crawl_delay=not args.ignore_crawl_delay, robots_cache=robots_cache
+    )
+    for start_url in start_urls:
+        urls_to_visit.push(start_url)
     results = {}
+    workers = summary_workers(args, len(ollama.endpoints))
+    budget = CrawlBudget(ollama, workers, time_budget=args.time_budget, token_budget=args.token_budget, max_pages=args.depth)
+    store = None
+    if args.db:
+        store = ReportStore(args.db)
+        store.start_run(" ".join(start_urls), args.model)
+
+    def summary_done(url, seconds):
+        budget.record_summary(url, seconds)
+        if store:
+            store.add_summary(url, results[url], seconds)
+
+    pipeline = SummaryPipeline(ollama, results, workers=workers, on_complete=summary_done,
+                               clusters=clusters, embed_model=args.embed_model)
+
+    def prefetch_candidate():
+        """
+        The URL the scheduler would hand out next, reserved (token and concurrency slot)
+        if its host may be fetched right now; the next pop() returns it. Called once the
+        current page's DOM is captured, so that page no longer counts against its host's cap.
+        """
+        urls_to_visit.release(current_url)
+        candidate = urls_to_visit.peek()
+        if candidate is None or candidate in visited_urls or len(visited_urls) >= args.depth:
+            return None
+        return candidate if urls_to_visit.reserve(candidate) else None
+
+    interrupted = False
+    started = time.time()
     
     logger.info("Starting scrape process...")
     
     try:
         while urls_to_visit and len(visited_urls) < args.depth:
-            current_url = urls_to_visit.pop(0)
+            current_url = urls_to_visit.pop()
+            if current_url is None:
+                break
             
             if current_url in visited_urls:
+                urls_to_visit.release(current_url)
                 continue
+
+            # Only take the page if it and the summaries already queued still fit the budgets
+            if not budget.can_admit(pipeline.outstanding()):
+                logger.info(f"Stopping early ({budget.stop_reason}).")
+                break
                 
             visited_urls.add(current_url)
             logger.info(f"Processing ({len(visited_urls)}/{args.depth}): {current_url}")
             
             # Scrape content
-            text_content, soup = scraper.get_page_content(current_url)
+            scrape_start = time.time()
+            text_content, soup = scraper.get_page_content(current_url, next_url=prefetch_candidate if args.prefetch else None)
+            urls_to_visit.release(current_url)
+            scrape_seconds = time.time() - scrape_start
+            budget.record_scrape(scrape_seconds)
+            logger.info(f"Scraped {current_url} in {scrape_seconds:.2f}s",
+                        extra={"url": current_url, "stage": "scrape", "duration": scrape_seconds})
+            if store:
+                store.add_page(current_url, scrape_seconds, graph.score(current_url))
             
             if not text_content:
                 logger.warning(f"No content found for {current_url}")
                 results[current_url] = "Error: Could not extract content."
+                logger.info(budget.status_line(pipeline.outstanding(), len(urls_to_visit)))
                 continue
                 
-            # Summarize content
-            logger.info(f"Summarizing content for {current_url}...")
-            summary = ollama.generate_summary(text_content)
-            results[current_url] = summary
-            logger.info("Summary generated.")
+            # Summarize content in the background while the next page is scraped,
+            # more important pages first when summaries queue up
+            priority = -graph.score(current_url) if args.order == "importance" else 0
+            pipeline.submit(current_url, text_content, priority=priority)
+            budget.record_queued(text_content)
             
-            # Find new links
+            # Find new links and update the importance scores
             if soup:
-                links = scraper.get_links(soup, current_url)
+                links = [link for link in scraper.get_links(soup, current_url) if any(is_valid_url(link, domain) for domain in domains)]
+                graph.add_links(current_url, links)
+                if store:
+                    store.add_links(current_url, links)
+                graph.update_pagerank()
                 for link in links:
-                    if link not in visited_urls and is_valid_url(link, base_domain):
-                        urls_to_visit.append(link)
+                    if link not in visited_urls:
+                        urls_to_visit.push(link)
+                urls_to_visit.rerank()
+            logger.info(budget.status_line(pipeline.outstanding(), len(urls_to_visit)))
     
     except KeyboardInterrupt:
         logger.info("Scraping interrupted by user.")
+        interrupted = True
     except Exception as e:
         logger.error(f"Critical error in main loop: {e}")
     finally:
-        scraper.close()
+        logger.info(f"Waiting for {pipeline.pending()} queued summaries...")
+        pipeline.close(cancel=interrupted)
+        if clusters:
+            clusters.attach_summaries(results)
+            clusters.log_summary()
+        if args.site_summary and not interrupted:
+            write_site_summary(args, ollama, results)
+        urls_to_visit.log_stats()
+        if args.graph_out:
+            graph.export(args.graph_out)
+        if store:
+            store.add_results(results)
+            store.close()
         
         # Save results
-        output_file = "summary_report.json"
-        with open(output_file, "w", encoding='utf-8') as f:
-            json.dump(results, f, indent=4)
-
-        # Save results as TXT
-        txt_output_file = "summary_report.txt"
-        with open(txt_output_file, "w", encoding='utf-8') as f:
-             for url, summary in results.items():
-                f.write(f"URL: {url}\n")
-                f.write(f"SUMMARY:\n{summary}\n")
-                f.write("-" * 80 + "\n\n")
+        save_results(results, output_file, txt_output_file)
             
         logger.info(f"Scraping complete. Visited {len(visited_urls)} pages.")
         logger.info(f"Results saved to {output_file}")
-        
-        # Print a preview
-        print("\n--- Scrape Summary Preview ---")
-        for i, (url, summary) in enumerate(list(results.items())[:3]):
-            print(f"\nURL: {url}")
-            print(f"Summary: {summary[:150]}...")
+
+    stats = {
+        "pages": len(visited_urls),
+        "summaries": pipeline.completed,
+        "seconds": time.time() - started,
+        "tokens": budget.tokens_used(),
+        "interrupted": interrupted,
+    }
+    return results, stats
+
+# Settings a job line may override; everything else comes from the command line
+JOB_OPTIONS = ("url", "model", "small_model", "depth", "order", "time_budget", "token_budget", "host_rate", "host_burst",
+               "cluster", "site_summary", "db", "graph_out")
+
+def load_jobs(path):
+    """
+    Reads a --jobs JSONL file: one object per line with an optional "job_id" and any of
+    JOB_OPTIONS, e.g. {"job_id": "news", "url": "https://example.com", "model": "llama3", "depth": 20}.
+    Invalid lines are logged and skipped. Returns a list of (job_id, overrides).
+    """
+    jobs = []
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.error(f"{path}:{line_number}: invalid JSON, skipping: {e}")
+                continue
+            job_id = str(job.pop("job_id", f"job-{line_number}"))
+            unknown = sorted(set(job) - set(JOB_OPTIONS))
+            if unknown:
+                logger.error(f"{path}:{line_number}: unknown job settings {unknown}, skipping")
+                continue
+            if not job.get("url"):
+                logger.error(f"{path}:{line_number}: job {job_id} has no url, skipping")
+                continue
+            if job_id in seen:
+                logger.error(f"{path}:{line_number}: duplicate job_id {job_id}, skipping")
+                continue
+            if isinstance(job["url"], str):
+                job["url"] = [job["url"]]
+            seen.add(job_id)
+            jobs.append((job_id, job))
+    return jobs
+
+def run_jobs(args):
+    """
+    Runs every job of a --jobs file in this process. The browser, one Ollama client per
+    model and the robots.txt cache are shared between jobs. Each job writes
+    <jobs-out>/<job_id>.json/.txt, and jobs_summary.json has the per-job and overall throughput.
+    """
+    jobs = load_jobs(args.jobs)
+    if not jobs:
+        logger.error(f"No runnable jobs in {args.jobs}")
+        return
+    os.makedirs(args.jobs_out, exist_ok=True)
+
+    from scraper import WebScraper
+    archive = PageArchive(args.archive, codec=args.archive_codec) if args.archive else None
+    scraper = WebScraper(headless=args.headless, archive=archive, page_load_strategy=args.page_load_strategy,
+                         extract_mode=args.extract_mode, supervisor=browser_supervisor(args))
+    clients = {}
+    robots_cache = {}
+    job_stats = []
+    started = time.time()
+    try:
+        for number, (job_id, overrides) in enumerate(jobs, 1):
+            job_args = argparse.Namespace(**{**vars(args), **overrides})
+            logger.info(f"Job {number}/{len(jobs)} ({job_id}): {' '.join(job_args.url)} with {job_args.model}, depth {job_args.depth}")
+            ollama = clients.get((job_args.model, job_args.small_model))
+            if ollama is None:
+                ollama = build_ollama_client(job_args)
+                if not ollama:
+                    job_stats.append({"job_id": job_id, "model": job_args.model, "error": "Ollama is not accessible"})
+                    continue
+                clients[(job_args.model, job_args.small_model)] = ollama
+
+            output_file = os.path.join(args.jobs_out, f"{job_id}.json")
+            txt_output_file = os.path.join(args.jobs_out, f"{job_id}.txt")
+            _, stats = crawl(job_args, ollama, scraper, output_file, txt_output_file, robots_cache=robots_cache)
+            job_stats.append({"job_id": job_id, "model": job_args.model, "urls": job_args.url, **stats})
+            if stats["interrupted"]:
+                break
+    finally:
+        scraper.close()
+        if archive:
+            archive.close()
+
+    for ollama in clients.values():
+        ollama.log_metrics()
+
+    elapsed = time.time() - started
+    finished = [stats for stats in job_stats if "error" not in stats]
+    pages = sum(stats["pages"] for stats in finished)
+    summaries = sum(stats["summaries"] for stats in finished)
+    for stats in job_stats:
+        if "error" in stats:
+            logger.info(f"  {stats['job_id']}: failed ({stats['error']})")
+        else:
+            minutes = max(stats["seconds"] / 60, 1e-9)
+            logger.info(
+                f"  {stats['job_id']}: {stats['pages']} pages, {stats['summaries']} summaries in {stats['seconds']:.1f}s "
+                f"({stats['pages'] / minutes:.1f} pages/min, {stats['tokens']} tokens)"
+            )
+    aggregate = {
+        "jobs": len(jobs),
+        "completed": len(finished),
+        "failed": len(job_stats) - len(finished),
+        "pages": pages,
+        "summaries": summaries,
+        "seconds": elapsed,
+        "pages_per_min": pages * 60 / max(elapsed, 1e-9),
+        "summaries_per_min": summaries * 60 / max(elapsed, 1e-9),
+    }
+    logger.info(
+        f"{aggregate['completed']}/{len(jobs)} jobs done in {elapsed:.1f}s: {pages} pages "
+        f"({aggregate['pages_per_min']:.1f}/min), {summaries} summaries ({aggregate['summaries_per_min']:.1f}/min)"
+    )
+    summary_file = os.path.join(args.jobs_out, "jobs_summary.json")
+    with open(summary_file, "w", encoding='utf-8') as f:
+        json.dump({"total": aggregate, "jobs": job_stats}, f, indent=4)
+    logger.info(f"Job reports saved to {args.jobs_out}")
+
+def query(argv):
+    """
+    `python main.py query`: full-text search, run listing and merging for report databases.
+    """
+    parser = argparse.ArgumentParser(prog="main.py query", description="Search and merge report databases written with --db")
+    parser.add_argument("db", help="Report database")
+    parser.add_argument("terms", nargs="?", help="FTS5 search over the summaries, e.g. 'python AND tutorial' or 'sum*'")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of matches (default: 20)")
+    parser.add_argument("--run", type=int, default=None, help="Only search this run")
+    parser.add_argument("--runs", action="store_true", help="List the runs in the database")
+    parser.add_argument("--merge", type=str, metavar="OTHER_DB", help="Copy every run of OTHER_DB into the database")
+    args = parser.parse_args(argv)
+    if not (args.terms or args.runs or args.merge):
+        parser.error("give search terms, --runs or --merge")
+
+    if args.merge:
+        try:
+            count = merge(args.db, args.merge)
+        except sqlite3.DatabaseError as e:
+            parser.error(f"cannot merge {args.merge} into {args.db}: {e}")
+        print(f"Merged {count} runs from {args.merge} into {args.db}")
+    try:
+        if args.runs:
+            for run_id, start_url, model, started, finished, pages in list_runs(args.db):
+                started = time.strftime("%Y-%m-%d %H:%M", time.localtime(started)) if started else "-"
+                print(f"{run_id:>4}  {started}  {pages:>5} pages  {model}  {start_url}")
+        if args.terms:
+            start = time.perf_counter()
+            matches = search(args.db, args.terms, limit=args.limit, run_id=args.run)
+            for run_id, url, snippet, rank in matches:
+                print(f"[run {run_id}] {url}\n    {snippet}")
+            print(f"{len(matches)} matches in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except sqlite3.DatabaseError as e:
+        # Missing or foreign database file, or a malformed FTS5 query such as 'c++'
+        parser.error(f"{args.db}: {e}")
+
+def main():
+    if sys.argv[1:2] == ["query"]:
+        query(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="Recursive Selenium Web Scraper with Ollama Summarization")
+    parser.add_argument("--url", type=str, action="append", help="Base URL to start scraping from; repeat to crawl several sites in one run")
+    parser.add_argument("--jobs", type=str, help="Run every crawl job of this JSONL file (url, model, depth, ... per line) in one process")
+    parser.add_argument("--jobs-out", type=str, default="job_reports", help="Directory for the per-job reports and jobs_summary.json (default: job_reports)")
+    parser.add_argument("--file", type=str, action="append", help="Summarize a local HTML or text file instead of crawling (repeatable, no browser)")
+    parser.add_argument("--stdin", action="store_true", help="Summarize HTML or text read from stdin instead of crawling (no browser)")
+    parser.add_argument("--model", type=str, default="mistral", help="Ollama model to use (default: mistral)")
+    parser.add_argument("--small-model", type=str, default=None, help="Faster model for short pages (see --small-max-chars); off by default")
+    parser.add_argument("--small-max-chars", type=int, default=1500, help="Pages with at most this many characters of text go to --small-model (default: 1500)")
+    parser.add_argument("--num-predict", type=int, default=256, help="Max tokens --model may generate per summary (default: 256, 0 for no cap)")
+    parser.add_argument("--small-num-predict", type=int, default=128, help="Max tokens --small-model may generate per summary (default: 128, 0 for no cap)")
+    parser.add_argument("--stop", action="append", default=None, help="Stop sequence for summaries; can be repeated (default: the prompt's text markers)")
+    parser.add_argument("--ollama-url", action="append", help="Ollama endpoint; repeat to load-balance across several servers (default: http://localhost:11434)")
+    parser.add_argument("--routing", choices=ROUTING_POLICIES, default="least-outstanding", help="How requests are spread across endpoints (default: least-outstanding)")
+    parser.add_argument("--summary-workers", type=int, default=None, help="Concurrent summarization requests (default: one per endpoint)")
+    parser.add_argument("--prompt-mode", choices=PROMPT_MODES, default="inline", help="Send the summary instructions inline, as a cacheable system prompt, or via /api/chat (default: inline)")
+    parser.add_argument("--cluster", type=float, default=None, metavar="SIMILARITY", help="Embed every page and only summarize one page per topic; pages whose cosine similarity to a summarized page reaches this value (e.g. 0.9) reuse its summary. Requires numpy")
+    parser.add_argument("--embed-model", type=str, default="nomic-embed-text", help="Ollama embedding model for --cluster (default: nomic-embed-text)")
+    parser.add_argument("--site-summary", type=str, help="Also reduce the page summaries to per-section and whole-site summaries and save them to this JSON file")
+    parser.add_argument("--digest-context", type=int, default=12000, help="Characters of summaries sent per site-summary call (default: 12000)")
+    parser.add_argument("--llm-stats", type=str, help="Write per-call prompt_eval_count/prompt_eval_duration stats to this JSON file")
+    parser.add_argument("--adaptive-concurrency", action="store_true", help="Adjust concurrent summary requests to the server's latency (AIMD); --summary-workers becomes the upper bound")
+    parser.add_argument("--connect-timeout", type=float, default=5, help="Seconds to wait for a connection to Ollama (default: 5)")
+    parser.add_argument("--read-timeout", type=float, default=120, help="Seconds to wait for a generation to finish (default: 120)")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retries for timeouts, connection errors and 5xx responses (default: 2)")
+    parser.add_argument("--hedge-after", type=hedge_delay, default=None, help="Seconds before a straggling request is duplicated, or 'auto' for the observed p95 (default: off)")
+    parser.add_argument("--breaker-threshold", type=int, default=5, help="Consecutive failed requests that pause summarization (default: 5)")
+    parser.add_argument("--breaker-reset", type=float, default=30, help="Seconds summarization stays paused before a trial request (default: 30)")
+    parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
+    parser.add_argument("--page-load-strategy", choices=PAGE_LOAD_STRATEGIES, default="normal", help="When driver.get returns: after all subresources (normal), at DOMContentLoaded (eager) or immediately (none) (default: normal)")
+    parser.add_argument("--extract-mode", choices=EXTRACT_MODES, default="soup", help="Extract with BeautifulSoup from page_source (soup) or inside the browser with one script call that returns only text and links (dom) (default: soup)")
+    parser.add_argument("--prefetch", action="store_true", help="Load the probable next page in a background tab while the current one is parsed")
+    parser.add_argument("--recycle-pages", type=int, default=0, help="Restart the browser after this many pages (default: 0, never)")
+    parser.add_argument("--recycle-rss-mb", type=float, default=0, help="Restart the browser once Chrome's process tree uses more than this many MB of RSS, checked every 5 pages (default: 0, never)")
+    parser.add_argument("--recycle-timeouts", type=int, default=3, help="Restart the browser after this many consecutive page load timeouts (default: 3, 0 disables)")
+    parser.add_argument("--depth", type=int, default=10, help="Max unique pages to visit (default: 10)")
+    parser.add_argument("--time-budget", type=float, default=None, help="Stop taking new pages once scraping plus the queued summaries would exceed this many seconds")
+    parser.add_argument("--token-budget", type=int, default=None, help="Stop taking new pages once the projected prompt+completion tokens would exceed this")
+    parser.add_argument("--host-rate", type=float, default=1.0, help="Pages per second fetched from any one host (default: 1.0)")
+    parser.add_argument("--host-burst", type=int, default=1, help="Pages a host may be sent back to back before --host-rate applies (default: 1)")
+    parser.add_argument("--host-concurrency", type=int, default=1, help="Pages of one host loading at the same time (default: 1)")
+    parser.add_argument("--ignore-crawl-delay", action="store_true", help="Do not slow down to the Crawl-delay in a host's robots.txt")
+    parser.add_argument("--order", choices=("importance", "fifo"), default="importance", help="Crawl and summarize the most linked-to pages first (PageRank), or in discovery order (default: importance)")
+    parser.add_argument("--db", type=str, help="Also write pages, summaries, timings and link edges to this SQLite database (searchable with 'main.py query')")
+    parser.add_argument("--graph-out", type=str, help="Export the link graph (nodes with PageRank/in-degree, edges) to this JSON file")
+    parser.add_argument("--archive", type=str, help="Append the rendered page source of every visited page to this archive")
+    parser.add_argument("--archive-codec", choices=CODECS, default="gzip", help="Compression used for new archive records (default: gzip)")
+    parser.add_argument("--replay", type=str, help="Re-run extraction from an archive instead of crawling (no browser)")
+    parser.add_argument("--replay-summarize", action="store_true", help="Also summarize replayed pages with Ollama")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for replay decompression (default: CPU count)")
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="text", help="Format of scraper.log: text lines or JSON events with url/stage/duration fields (default: text)")
+    parser.add_argument("--log-sample", type=sample_rate, action="append", metavar="LOGGER=RATE", help="Keep only this fraction of a logger's INFO/DEBUG messages, e.g. summary_pipeline=0.1 (repeatable)")
+    parser.add_argument("--log-max-bytes", type=int, default=10 * 1024 * 1024, help="Rotate scraper.log at this size (default: 10 MB)")
+    parser.add_argument("--log-backups", type=int, default=3, help="Rotated log files to keep (default: 3)")
+    parser.add_argument("--profile", type=str, default=None, help="Profile the run and write PREFIX.collapsed (flame graph stacks), PREFIX.txt (hotspots) and, with cprofile, PREFIX.prof")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, default="sampling", help="Low-overhead stack sampling only, or also trace every call of the main thread with cProfile (default: sampling)")
+    parser.add_argument("--profile-interval", type=float, default=10, help="Milliseconds between stack samples (default: 10)")
+    parser.add_argument("--profile-top", type=int, default=25, help="Functions listed in the hotspot table (default: 25)")
+    
+    args = parser.parse_args()
+    setup_logging(log_format=args.log_format, max_bytes=args.log_max_bytes, backups=args.log_backups, sample_rates=args.log_sample)
+
+    if args.profile:
+        with RunProfiler(args.profile, mode=args.profile_mode, interval=args.profile_interval / 1000, top=args.profile_top):
+            run(args, parser)
+    else:
+        run(args, parser)
+
+def run(args, parser):
+    """Runs the mode selected on the command line."""
+    if args.replay:
+        if args.cluster is not None and not args.replay_summarize:
+            parser.error("--cluster needs --replay-summarize when replaying an archive")
+        replay(args)
+        return
+    if args.jobs:
+        run_jobs(args)
+        return
+    if args.file or args.stdin:
+        summarize_local(args)
+        return
+    if not args.url:
+        parser.error("--url is required unless --replay, --jobs, --file or --stdin is given")
+    
+    # Initialize components
+    ollama = build_ollama_client(args)
+    if not ollama:
+        return
+
+    # Browser and numpy stacks are only imported by the runs that use them
+    from scraper import WebScraper
+    archive = PageArchive(args.archive, codec=args.archive_codec) if args.archive else None
+    scraper = WebScraper(headless=args.headless, archive=archive, page_load_strategy=args.page_load_strategy,
+                         extract_mode=args.extract_mode, supervisor=browser_supervisor(args))
+    try:
+        results, _ = crawl(args, ollama, scraper)
+    finally:
+        scraper.close()
+        if archive:
+            archive.close()
+    report_llm_metrics(args, ollama)
+    
+    # Print a preview
+    print("\n--- Scrape Summary Preview ---")
+    for i, (url, summary) in enumerate(list(results.items())[:3]):
+        print(f"\nURL: {url}")
+        print(f"Summary: {summary[:150]}...")
 
 if __name__ == "__main__":
     main()
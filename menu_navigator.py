@@ -1,20 +1,22 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 import time
 import logging
 
+from link_checker import CHECK_MODES, check_links
+from page_load import PAGE_LOAD_STRATEGIES, apply_page_load_strategy, navigate
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def setup_driver():
+def setup_driver(page_load_strategy="normal"):
     options = Options()
+    apply_page_load_strategy(options, page_load_strategy)
     # options.add_argument("--headless=new") # Commented out so user can see the navigation
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
@@ -25,13 +27,18 @@ def setup_driver():
     driver.set_page_load_timeout(30)
     return driver
 
-def navigate_menus(start_url, max_links=10):
-    driver = setup_driver()
+def navigate_menus(start_url, max_links=10, page_load_strategy="normal", check="browser", check_workers=16):
+    """
+    Collects the menu links of start_url and confirms that they load. With check="http"
+    the links are first checked with concurrent HTTP requests and only the ones that
+    fail or look JavaScript-rendered are loaded in the browser.
+    """
+    driver = setup_driver(page_load_strategy)
     visited_links = set()
     
     try:
         logger.info(f"Navigating to home page: {start_url}")
-        driver.get(start_url)
+        navigate(driver, start_url, page_load_strategy)
         time.sleep(2) # Allow initial load
         
         # 1. Find all potential menu links
@@ -73,6 +80,13 @@ def navigate_menus(start_url, max_links=10):
                 seen_hrefs.add(href)
         
         logger.info(f"Found {len(unique_links)} potential menu links.")
+
+        if check == "http":
+            # Relative hrefs were already resolved by get_attribute("href")
+            unique_links = unique_links[:max_links]
+            results = check_links([href for _, href in unique_links], workers=check_workers)
+            escalate = {result["url"] for result in results if result["escalate"]}
+            unique_links = [(text, href) for text, href in unique_links if href in escalate]
         
         # 2. Iterate and click
         count = 0
@@ -83,10 +97,8 @@ def navigate_menus(start_url, max_links=10):
             logger.info(f"Processing menu item {count+1}/{max_links}: '{text}' -> {href}")
             
             try:
-                driver.get(href)
-                
-                # Check title to confirm valid load
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                # Check the DOM is ready to confirm valid load
+                navigate(driver, href, page_load_strategy)
                 logger.info(f"Successfully loaded: {driver.title}")
                 
                 time.sleep(1) # Pause to simulate viewing
@@ -108,6 +120,9 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Menu Navigator")
     parser.add_argument("--url", type=str, required=True, help="Website to navigate")
+    parser.add_argument("--page-load-strategy", choices=PAGE_LOAD_STRATEGIES, default="normal", help="Selenium page load strategy (default: normal)")
+    parser.add_argument("--check", choices=CHECK_MODES, default="browser", help="Load every link in the browser, or check them over HTTP first and only load failures and JavaScript-rendered pages (default: browser)")
+    parser.add_argument("--check-workers", type=int, default=16, help="Concurrent HTTP checks with --check http (default: 16)")
     args = parser.parse_args()
     
-    navigate_menus(args.url)
\ No newline at end of file
+    navigate_menus(args.url, page_load_strategy=args.page_load_strategy, check=args.check, check_workers=args.check_workers)
\ No newline at end of file
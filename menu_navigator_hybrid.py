@@ -2,8 +2,6 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 
@@ -11,6 +9,9 @@ from urllib.parse import urljoin, urlparse
 import time
 import logging
 
+from link_checker import CHECK_MODES, check_links
+from page_load import PAGE_LOAD_STRATEGIES, apply_page_load_strategy, navigate
+
 # ---------------- LOGGING ----------------
 
 logging.basicConfig(
@@ -21,8 +22,9 @@ logger = logging.getLogger(__name__)
 
 # ---------------- DRIVER SETUP ----------------
 
-def setup_driver():
+def setup_driver(page_load_strategy="normal"):
     options = Options()
+    apply_page_load_strategy(options, page_load_strategy)
     # options.add_argument("--headless=new")  # enable if needed
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
@@ -35,17 +37,17 @@ def setup_driver():
 
 # ---------------- MAIN LOGIC ----------------
 
-def navigate_menus(start_url, max_links=10):
-    driver = setup_driver()
+def navigate_menus(start_url, max_links=10, page_load_strategy="normal", check="browser", check_workers=16):
+    """
+    With check="http" the collected links are checked with concurrent HTTP requests and
+    only the ones that fail or look JavaScript-rendered are visited in the browser.
+    """
+    driver = setup_driver(page_load_strategy)
     visited = set()
 
     try:
         logger.info(f"Opening: {start_url}")
-        driver.get(start_url)
-
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        navigate(driver, start_url, page_load_strategy)
 
         parsed = urlparse(start_url)
         domain = parsed.netloc
@@ -125,18 +127,21 @@ def navigate_menus(start_url, max_links=10):
 
         logger.info(f"Total navigation links found: {len(final_links)}")
 
+        final_links = final_links[:max_links]
+        if check == "http":
+            results = check_links([url for _, url in final_links], workers=check_workers)
+            escalate = {result["url"] for result in results if result["escalate"]}
+            final_links = [(text, url) for text, url in final_links if url in escalate]
+
         # ==================================================
         # STEP 4: VISIT LINKS
         # ==================================================
 
-        for idx, (text, url) in enumerate(final_links[:max_links], start=1):
+        for idx, (text, url) in enumerate(final_links, start=1):
             logger.info(f"[{idx}] Visiting: {text} -> {url}")
 
             try:
-                driver.get(url)
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
+                navigate(driver, url, page_load_strategy)
                 visited.add(url)
                 time.sleep(1)
 
@@ -157,7 +162,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Hybrid Menu Navigator")
     parser.add_argument("--url", required=True, help="Start URL")
     parser.add_argument("--max", type=int, default=10, help="Max links to visit")
+    parser.add_argument("--page-load-strategy", choices=PAGE_LOAD_STRATEGIES, default="normal", help="Selenium page load strategy (default: normal)")
+    parser.add_argument("--check", choices=CHECK_MODES, default="browser", help="Visit every link in the browser, or check them over HTTP first and only visit failures and JavaScript-rendered pages (default: browser)")
+    parser.add_argument("--check-workers", type=int, default=16, help="Concurrent HTTP checks with --check http (default: 16)")
 
     args = parser.parse_args()
 
-    navigate_menus(args.url, args.max)
+    navigate_menus(args.url, args.max, args.page_load_strategy, args.check, args.check_workers)
@@ -0,0 +1,141 @@
+import gzip
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODECS = ("gzip", "zstd")
+
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def read_record(archive_path, offset, length, codec):
+    """
+    Reads and decompresses a single archived page.
+    Returns the stored page_source as a string.
+    """
+    with open(archive_path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    return _decompress(data, codec).decode("utf-8")
+
+
+def _replay_record(archive_path, entry):
+    """
+    Worker for parallel replay: decompresses one record and re-runs extraction on it.
+    Returns tuple (url, text_content, links).
+    """
+    from scraper import extract_content, extract_links
+
+    page_source = read_record(archive_path, entry["offset"], entry["length"], entry["codec"])
+    text, soup = extract_content(page_source, entry["url"])
+    return entry["url"], text, extract_links(soup, entry["url"])
+
+
+class PageArchive:
+    """
+    Append-only store of rendered page sources.
+
+    Every page is written as an independently compressed record to the archive file,
+    and its location is appended as one JSON line to a sidecar index (<archive>.idx),
+    so single pages can be read back without decompressing the whole archive.
+    """
+
+    def __init__(self, path, codec="gzip"):
+        self.logger = logging.getLogger(__name__)
+        if codec not in CODECS:
+            raise ValueError(f"Unknown archive codec: {codec}")
+        if codec == "zstd" and zstandard is None:
+            raise ImportError("The 'zstandard' package is required for zstd archives (pip install zstandard).")
+        self.path = path
+        self.index_path = path + ".idx"
+        self.codec = codec
+        self._data_file = None
+        self._index_file = None
+
+    def append(self, url, page_source):
+        """Compresses the page source and appends it, together with its index entry."""
+        if self._data_file is None:
+            self._data_file = open(self.path, "ab")
+            self._index_file = open(self.index_path, "a", encoding="utf-8")
+
+        data = _compress(page_source.encode("utf-8"), self.codec)
+        offset = self._data_file.tell()
+        self._data_file.write(data)
+        self._data_file.flush()
+
+        entry = {
+            "url": url,
+            "offset": offset,
+            "length": len(data),
+            "codec": self.codec,
+            "size": len(page_source),
+            "fetched_at": time.time(),
+        }
+        self._index_file.write(json.dumps(entry) + "\n")
+        self._index_file.flush()
+
+    def entries(self):
+        """
+        Reads the index. If a URL was archived more than once the latest record wins,
+        while the original crawl order is kept.
+        """
+        if not os.path.exists(self.index_path):
+            return []
+
+        latest = {}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if entry["url"] not in latest:
+                    latest[entry["url"]] = entry
+                else:
+                    latest[entry["url"]].update(entry)
+        return list(latest.values())
+
+    def get(self, url):
+        """Returns the latest archived page source for the URL, or None."""
+        for entry in self.entries():
+            if entry["url"] == url:
+                return read_record(self.path, entry["offset"], entry["length"], entry["codec"])
+        return None
+
+    def replay(self, workers=None):
+        """
+        Re-runs extraction over every archived page without a browser.
+        Decompression and parsing are spread over a process pool.
+        Yields tuples (url, text_content, links) in crawl order.
+        """
+        entries = self.entries()
+        self.logger.info(f"Replaying {len(entries)} archived pages from {self.path}")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_replay_record, self.path, entry) for entry in entries]
+            for future in futures:
+                yield future.result()
+
+    def close(self):
+        if self._data_file:
+            self._data_file.close()
+            self._index_file.close()
+            self._data_file = None
+            self._index_file = None
@@ -0,0 +1,66 @@
+import time
+
+# normal: driver.get waits for every subresource (load event)
+# eager:  driver.get returns at DOMContentLoaded
+# none:   driver.get returns as soon as navigation starts
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+# A new document gets a fresh window object, so the marker tells the old page from the new one
+_MARK_PREVIOUS_PAGE = "window.__previousPage = true;"
+_DOM_READY = "return !window.__previousPage && document.readyState !== 'loading';"
+# How far a page in a background tab must be loaded to match what navigate() waits for
+_LOADED = {
+    "normal": "return document.readyState === 'complete';",
+    "eager": "return document.readyState !== 'loading';",
+    "none": "return document.readyState !== 'loading';",
+}
+
+
+def apply_page_load_strategy(options, strategy):
+    if strategy not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(f"Unknown page load strategy: {strategy}")
+    options.page_load_strategy = strategy
+
+
+def navigate(driver, url, strategy="normal", timeout=10):
+    """
+    Loads the URL and waits until its DOM is usable.
+
+    With the eager and none strategies driver.get returns before the page has finished
+    loading, so readiness is checked explicitly: the new document must have replaced the
+    previous one and be parsed (readyState interactive or complete), and <body> must exist.
+    Returns the seconds spent inside driver.get.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    if strategy == "none":
+        try:
+            driver.execute_script(_MARK_PREVIOUS_PAGE)
+        except Exception:
+            pass
+
+    start = time.perf_counter()
+    driver.get(url)
+    get_seconds = time.perf_counter() - start
+
+    wait = WebDriverWait(driver, timeout)
+    if strategy == "none":
+        wait.until(lambda d: d.execute_script(_DOM_READY))
+    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    return get_seconds
+
+
+def wait_until_loaded(driver, strategy="normal", timeout=30):
+    """
+    Waits until the page in the current window (e.g. one opened with window.open) is as
+    far loaded as navigate() would have left it under the strategy, and <body> exists.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    wait = WebDriverWait(driver, timeout)
+    wait.until(lambda d: d.execute_script(_LOADED[strategy]))
+    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
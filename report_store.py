@@ -0,0 +1,212 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.request import pathname2url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    start_url TEXT,
+    model TEXT,
+    started REAL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    url TEXT NOT NULL,
+    summary TEXT,
+    scrape_seconds REAL,
+    summary_seconds REAL,
+    pagerank REAL,
+    UNIQUE (run_id, url)
+);
+CREATE TABLE IF NOT EXISTS links (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    src TEXT NOT NULL,
+    dst TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS links_src ON links (run_id, src);
+CREATE INDEX IF NOT EXISTS pages_url ON pages (url);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS summaries_fts USING fts5(
+    url, summary, content='pages', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS pages_ai AFTER INSERT ON pages BEGIN
+    INSERT INTO summaries_fts(rowid, url, summary) VALUES (new.id, new.url, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_ad AFTER DELETE ON pages BEGIN
+    INSERT INTO summaries_fts(summaries_fts, rowid, url, summary) VALUES ('delete', old.id, old.url, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_au AFTER UPDATE OF url, summary ON pages BEGIN
+    INSERT INTO summaries_fts(summaries_fts, rowid, url, summary) VALUES ('delete', old.id, old.url, old.summary);
+    INSERT INTO summaries_fts(rowid, url, summary) VALUES (new.id, new.url, new.summary);
+END;
+"""
+
+# Upserts, so page, timing and summary rows can arrive in any order
+_PAGE_SQL = (
+    "INSERT INTO pages (run_id, url, scrape_seconds, pagerank) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (run_id, url) DO UPDATE SET scrape_seconds = excluded.scrape_seconds, pagerank = excluded.pagerank"
+)
+_SUMMARY_SQL = (
+    "INSERT INTO pages (run_id, url, summary, summary_seconds) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (run_id, url) DO UPDATE SET summary = excluded.summary, "
+    "summary_seconds = coalesce(excluded.summary_seconds, pages.summary_seconds)"
+)
+_LINK_SQL = "INSERT INTO links (run_id, src, dst) VALUES (?, ?, ?)"
+
+
+class ReportStore:
+    """
+    SQLite report database: one row per page (summary, scrape/summary timings, PageRank),
+    the link edges, and an FTS5 index over the summaries.
+
+    Each crawl is a row in runs, so several crawls can live in (or be merged into) one
+    file. Writes are buffered and flushed with executemany in a single transaction every
+    batch_size rows; the database runs in WAL mode so it can be queried during a crawl.
+    """
+
+    def __init__(self, path, batch_size=200):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.run_id = None
+        self._pending = {_PAGE_SQL: [], _SUMMARY_SQL: [], _LINK_SQL: []}
+        self._buffered = 0
+        self._lock = threading.Lock()
+
+    def start_run(self, start_url, model):
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (start_url, model, started) VALUES (?, ?, ?)", (start_url, model, time.time())
+            )
+            self.conn.commit()
+            self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def _add(self, sql, rows):
+        with self._lock:
+            self._pending[sql].extend(rows)
+            self._buffered += len(rows)
+            if self._buffered >= self.batch_size:
+                self._flush()
+
+    def add_page(self, url, scrape_seconds=None, pagerank=None):
+        self._add(_PAGE_SQL, [(self.run_id, url, scrape_seconds, pagerank)])
+
+    def add_summary(self, url, summary, summary_seconds=None):
+        self._add(_SUMMARY_SQL, [(self.run_id, url, summary, summary_seconds)])
+
+    def add_links(self, source_url, target_urls):
+        self._add(_LINK_SQL, [(self.run_id, source_url, url) for url in target_urls])
+
+    def add_results(self, results):
+        """Stores every url -> summary of the results dict (errors and cancellations included)."""
+        self._add(_SUMMARY_SQL, [(self.run_id, url, summary, None) for url, summary in results.items()])
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        with self.conn:
+            for sql in (_PAGE_SQL, _SUMMARY_SQL, _LINK_SQL):
+                rows = self._pending[sql]
+                if rows:
+                    self.conn.executemany(sql, rows)
+                    rows.clear()
+        self._buffered = 0
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self.run_id is not None:
+                with self.conn:
+                    self.conn.execute("UPDATE runs SET finished = ? WHERE id = ?", (time.time(), self.run_id))
+            self.conn.close()
+        self.logger.info(f"Report database saved to {self.path}")
+
+
+def _read_only_uri(path):
+    """SQLite URI that opens path read-only and never creates it."""
+    return f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+
+
+def _connect_read_only(path):
+    return sqlite3.connect(_read_only_uri(path), uri=True)
+
+
+def search(path, query, limit=20, run_id=None):
+    """
+    Full-text search over the summaries (FTS5 query syntax), best matches first.
+    Returns (run_id, url, snippet, bm25 rank) tuples. Raises sqlite3.OperationalError
+    for a malformed query or a missing database.
+    """
+    conn = _connect_read_only(path)
+    try:
+        sql = (
+            "SELECT pages.run_id, pages.url, snippet(summaries_fts, 1, '[', ']', '...', 12), bm25(summaries_fts) AS rank "
+            "FROM summaries_fts JOIN pages ON pages.id = summaries_fts.rowid "
+            "WHERE summaries_fts MATCH ?"
+        )
+        params = [query]
+        if run_id is not None:
+            sql += " AND pages.run_id = ?"
+            params.append(run_id)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def list_runs(path):
+    """Returns (id, start_url, model, started, finished, page count) for every run."""
+    conn = _connect_read_only(path)
+    try:
+        return conn.execute(
+            "SELECT runs.id, runs.start_url, runs.model, runs.started, runs.finished, count(pages.id) "
+            "FROM runs LEFT JOIN pages ON pages.run_id = runs.id GROUP BY runs.id ORDER BY runs.id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def merge(path, other_path):
+    """
+    Copies every run of other_path into path under new run ids.
+    Returns the number of runs merged.
+    """
+    ReportStore(path).conn.close()  # make sure the target schema exists
+    conn = sqlite3.connect(path, uri=True)
+    try:
+        conn.execute("ATTACH DATABASE ? AS other", (_read_only_uri(other_path),))
+        with conn:
+            runs = conn.execute("SELECT id, start_url, model, started, finished FROM other.runs ORDER BY id").fetchall()
+            for old_id, start_url, model, started, finished in runs:
+                new_id = conn.execute(
+                    "INSERT INTO runs (start_url, model, started, finished) VALUES (?, ?, ?, ?)",
+                    (start_url, model, started, finished),
+                ).lastrowid
+                conn.execute(
+                    "INSERT INTO pages (run_id, url, summary, scrape_seconds, summary_seconds, pagerank) "
+                    "SELECT ?, url, summary, scrape_seconds, summary_seconds, pagerank FROM other.pages WHERE run_id = ?",
+                    (new_id, old_id),
+                )
+                conn.execute(
+                    "INSERT INTO links (run_id, src, dst) SELECT ?, src, dst FROM other.links WHERE run_id = ?",
+                    (new_id, old_id),
+                )
+        conn.execute("DETACH DATABASE other")
+        return len(runs)
+    finally:
+        conn.close()
@@ -0,0 +1,213 @@
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Libraries a slow run is usually blamed on; a sample counts towards the innermost one on its stack
+LIBRARIES = ("selenium", "bs4", "requests", "urllib3", "json", "sqlite3", "numpy", "logging")
+
+
+def _stage(thread_name):
+    """Root frame of a thread's stacks: main, summary, digest, ollama-hedge, ..."""
+    if thread_name == "MainThread":
+        return "main"
+    return thread_name.rstrip("0123456789").rstrip("-_") or thread_name
+
+
+def _label(code):
+    # co_qualname (Class.method) only exists on Python 3.11+
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+# Innermost frames of a thread that is blocked waiting for work: an idle summary worker in
+# queue.get, a thread in Condition.wait/Event.wait or joining another thread
+_IDLE_WAITS = {("queue.py", "get"), ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock")}
+
+
+def _is_idle(codes):
+    return bool(codes) and (os.path.basename(codes[-1].co_filename), codes[-1].co_name) in _IDLE_WAITS
+
+
+# Installed packages can live inside the checkout (.venv is gitignored) but are not repo code
+_ENVIRONMENT_DIRS = ("site-packages", "dist-packages", ".venv", "venv")
+
+
+def _is_repo_file(filename):
+    """True for this repository's own source files (WebScraper, OllamaClient, the crawl loop, ...)."""
+    if not os.path.isabs(filename):  # <string>, <frozen ...>, cProfile's "~" for builtins
+        return False
+    path = os.path.abspath(filename)
+    try:
+        if os.path.commonpath([path, REPO_DIR]) != REPO_DIR:
+            return False
+    except ValueError:  # different drives on Windows
+        return False
+    parts = os.path.relpath(path, REPO_DIR).split(os.sep)
+    return not any(part in _ENVIRONMENT_DIRS for part in parts) and path != os.path.abspath(__file__)
+
+
+def _in_scope(code):
+    return _is_repo_file(code.co_filename)
+
+
+def _library(code):
+    path = code.co_filename.replace("\\", "/")
+    for library in LIBRARIES:
+        if f"/{library}/" in path or path.endswith(f"/{library}.py"):
+            return library
+    return None
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of every thread each `interval` seconds (wall clock, so time
+    spent waiting on Selenium or Ollama counts). Identical stacks are counted together,
+    keyed by the thread's stage.
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.reverse()
+                self.stacks[(_stage(names.get(ident, "thread")), tuple(codes))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """Lines in the `frame;frame;frame count` format of flamegraph.pl and speedscope."""
+        lines = []
+        for (stage, codes), count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+            lines.append(f"{';'.join([stage] + [_label(code) for code in codes])} {count}")
+        return lines
+
+    def hotspots(self, top):
+        """
+        (stage, function, samples on stack, samples as innermost repo function) for repo
+        functions, samples per library, both sorted by the first count, and idle samples
+        per stage (blocked in a queue or condition wait), which are kept out of the first two.
+        Threads that never run repo code (the log listener, idle library pools) are left out.
+        """
+        total, own, libraries, idle = Counter(), Counter(), Counter(), Counter()
+        for (stage, codes), count in self.stacks.items():
+            scoped = [_label(code) for code in codes if _in_scope(code)]
+            if not scoped:
+                continue
+            if _is_idle(codes):
+                idle[stage] += count
+                continue
+            for label in set(scoped):
+                total[(stage, label)] += count
+            own[(stage, scoped[-1])] += count
+            library = next((name for name in map(_library, reversed(codes)) if name), "other")
+            libraries[library] += count
+        rows = [(stage, label, count, own[(stage, label)]) for (stage, label), count in total.most_common(top)]
+        return rows, libraries.most_common(), idle.most_common()
+
+
+class RunProfiler:
+    """
+    Profiles the code run inside `with RunProfiler(...)`.
+
+    Both modes write <prefix>.collapsed (all threads, one flame-graph tower per stage)
+    and <prefix>.txt (top repo functions and time per library). "cprofile" additionally
+    traces every call on the main thread (the crawl loop: Selenium, BeautifulSoup, JSON
+    writing) into <prefix>.prof for pstats/snakeviz; "sampling" only samples, for low overhead.
+    """
+
+    def __init__(self, prefix, mode="sampling", interval=0.01, top=25):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.logger = logging.getLogger(__name__)
+        self.prefix = prefix
+        self.mode = mode
+        self.top = top
+        self.sampler = StackSampler(interval)
+        self.profile = cProfile.Profile() if mode == "cprofile" else None
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.sampler.start()
+        if self.profile:
+            self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profile:
+            self.profile.disable()
+        self.sampler.stop()
+        try:
+            self.write(time.perf_counter() - self.started)
+        except OSError as e:
+            self.logger.error(f"Could not write profile to {self.prefix}.*: {e}")
+        return False
+
+    def _report(self, seconds):
+        rows, libraries, idle = self.sampler.hotspots(self.top)
+        samples = max(self.sampler.samples, 1)
+        lines = [
+            f"Profile ({self.mode}): {seconds:.1f}s wall, {self.sampler.samples} samples every "
+            f"{self.sampler.interval * 1000:.0f} ms (all threads)",
+            "",
+            f"{'stage':<14} {'samples on stack':>16} {'innermost':>10}  function",
+        ]
+        lines += [f"{stage[:14]:<14} {count:>16} {own:>10}  {label}" for stage, label, count, own in rows]
+        lines += ["", f"{'samples':>8} {'per sample':>10}  library (innermost on the stack)"]
+        lines += [f"{count:>8} {count / samples:>10.2f}  {library}" for library, count in libraries]
+        if idle:
+            lines += ["", f"{'samples':>8} {'per sample':>10}  idle stage (waiting in queue.get / Condition.wait)"]
+            lines += [f"{count:>8} {count / samples:>10.2f}  {stage}" for stage, count in idle]
+
+        if self.profile:
+            lines += ["", f"Main thread, deterministic (top {self.top} repo functions by cumulative time):",
+                      f"{'calls':>8} {'tottime':>9} {'cumtime':>9}  function"]
+            stats = pstats.Stats(self.profile).stats
+            scoped = [(key, value) for key, value in stats.items() if _is_repo_file(key[0])]
+            scoped.sort(key=lambda item: item[1][3], reverse=True)
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in scoped[:self.top]:
+                lines.append(f"{calls:>8} {tottime:>9.3f} {cumtime:>9.3f}  {os.path.basename(filename)}:{line}({name})")
+        return lines
+
+    def write(self, seconds):
+        with open(f"{self.prefix}.collapsed", "w", encoding='utf-8') as f:
+            f.write("\n".join(self.sampler.collapsed()) + "\n")
+        report = self._report(seconds)
+        with open(f"{self.prefix}.txt", "w", encoding='utf-8') as f:
+            f.write("\n".join(report) + "\n")
+        written = [f"{self.prefix}.collapsed", f"{self.prefix}.txt"]
+        if self.profile:
+            self.profile.dump_stats(f"{self.prefix}.prof")
+            written.append(f"{self.prefix}.prof")
+        print("\n".join(report))
+        self.logger.info(f"Profile written to {', '.join(written)}")
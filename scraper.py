@@ -1,22 +1,146 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
 from bs4 import BeautifulSoup
+import json
 import logging
 import time
+from urllib.parse import urljoin
+
+from browser_supervisor import BrowserSupervisor
+from dom_extraction import extract_in_browser
+from extraction_profiles import profile_for_url
+from page_load import apply_page_load_strategy, navigate, wait_until_loaded
+
+logger = logging.getLogger(__name__)
+
+# window.open target of the background tab; opening it again reuses the same tab
+PREFETCH_WINDOW = "crawler-prefetch"
+
+def extract_content(page_source, url=None, profile=None):
+    """
+    Extracts the main text from a rendered page source.
+    Kept separate from navigation so archived pages can be re-extracted without a browser.
+    The extraction profile is picked from the URL's host unless one is given.
+    Returns tuple (text_content, soup_object).
+    """
+    profile = profile or profile_for_url(url)
+    soup = BeautifulSoup(page_source, 'html.parser')
+    
+    # Remove scripts, styles, and navigation to reduce noise
+    for script in soup(["script", "style", "nav", "footer", "header", "noscript"]):
+        script.decompose()
+
+    # Smart extraction: Limit to first 2 sections (roughly)
+    # Strategy: Collect text from paragraphs and headers until we see the 3rd h2 or hit a length limit.
+    content_parts = []
+    header_count = 0
+    char_count = 0
+    
+    # Jump straight to the site's article subtree if the profile knows it,
+    # otherwise find the main content area (Wikipedia specific but good generic fallback)
+    main_content = profile.find_root(soup)
+    if main_content is None:
+        main_content = soup.find(id="mw-content-text") or soup.find("main") or soup.find("article") or soup.body
+    elif profile.exclude:
+        for element in profile.exclude.select(main_content):
+            element.decompose()
+    
+    if main_content:
+        # Iterate over direct children or important tags
+        for element in main_content.find_all(['h1', 'h2', 'h3', 'p'], recursive=True):
+            text_chunk = element.get_text(separator=' ', strip=True)
+            
+            # Skip (or stop at) sections whose header matches a stop keyword
+            if element.name in ['h1', 'h2', 'h3']:
+                if profile.is_stop_header(text_chunk):
+                    if profile.stop_action == "break":
+                        logger.info(f"Hit pedagogical or footer section ({text_chunk}). Stopping extraction.")
+                        break
+                    logger.info(f"Skipping section: {text_chunk}")
+                    continue
+
+                header_count += 1
+            
+            if text_chunk:
+                content_parts.append(text_chunk)
+                char_count += len(text_chunk)
+            
+            # Stop if we have seen enough sections (Intro + 2 sections = ~3 headers usually)
+            # or if we have enough text.
+            if header_count >= profile.max_sections or char_count > profile.max_chars:
+                logger.info(f"Truncating content at {header_count} headers / {char_count} chars.")
+                break
+    
+    if not content_parts:
+         # Fallback to standard get_text if smart extraction failed
+         text = soup.get_text(separator=' ', strip=True)
+    else:
+        text = " ".join(content_parts)
+
+    return text, soup
+
+
+def extract_links(soup, base_url):
+    """
+    Extracts all valid hrefs from the soup object.
+    """
+    if not soup:
+        return []
+    return resolve_links((a_tag['href'] for a_tag in soup.find_all('a', href=True)), base_url)
+
+
+def resolve_links(hrefs, base_url):
+    """
+    Keeps absolute http(s) and root-relative hrefs, resolved against base_url, without duplicates.
+    """
+    links = []
+    for href in hrefs:
+        # Basic filtering
+        if href.startswith('http'):
+            links.append(href)
+        elif href.startswith('/'):
+            # Handle relative URLs
+            full_url = urljoin(base_url, href)
+            links.append(full_url)
+            
+    # Remove duplicates
+    return list(set(links))
+
 
 class WebScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, archive=None, page_load_strategy="normal", extract_mode="soup", supervisor=None):
+        """
+        extract_mode "soup" transfers page_source and parses it with BeautifulSoup;
+        "dom" runs the extraction inside the page and only transfers text and links.
+        supervisor (a BrowserSupervisor) decides when the browser is replaced by a fresh one;
+        by default it is recycled after 3 consecutive page load timeouts.
+        """
         self.logger = logging.getLogger(__name__)
+        self.headless = headless
+        self.archive = archive
+        self.supervisor = supervisor or BrowserSupervisor()
+        self.page_load_strategy = page_load_strategy
+        self.extract_mode = extract_mode
+        # Bytes received over the WebDriver wire and Python CPU time spent extracting
+        self.extract_pages = 0
+        self.extract_bytes = 0
+        self.extract_cpu = 0.0
+        # Background tab prefetching (see get_page_content's next_url)
+        self.prefetches = 0
+        self.prefetch_hits = 0
+        self.prefetch_saved = 0.0
+        self.navigation_ewma = None
         self.driver = self._setup_driver(headless)
+        self._reset_tabs()
 
     def _setup_driver(self, headless):
+        # Imported here so extraction-only users (replay, local files) never load the browser stack
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
         options = Options()
+        apply_page_load_strategy(options, self.page_load_strategy)
         if headless:
             options.add_argument("--headless=new")
         options.add_argument("--no-sandbox")
@@ -34,113 +158,206 @@ class WebScraper:
             self.logger.error(f"Failed to initialize Chrome driver: {e}")
             raise
 
-    def get_page_content(self, url):
+    def get_page_content(self, url, next_url=None):
         """
         Navigates to the URL and extracts text content.
         Returns tuple (text_content, soup_object) or (None, None) on failure.
+        In dom mode the second item is the page's link list instead of a soup.
+        A page that timed out right before the browser was recycled is tried once more.
+
+        next_url is an optional callable returning the URL that will probably be requested
+        next (or None). It is called as soon as this page's DOM has been captured, and that
+        URL starts loading in a background tab while this page is parsed.
         """
+        text, soup, timed_out = self._load_page(url, next_url)
+        if self._after_page(timed_out) and timed_out:
+            self.logger.info(f"Retrying {url} in the fresh browser")
+            text, soup, timed_out = self._load_page(url, next_url)
+            self._after_page(timed_out)
+        return text, soup
+
+    def _load_page(self, url, next_url=None):
+        """Returns (text, soup or links, timed out)."""
         try:
             self.logger.info(f"Navigating to: {url}")
-            self.driver.get(url)
-            
-            # Wait for body to be present
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Give a small buffer for dynamic content (optional but helpful)
-            time.sleep(1) 
+            if not self._use_prefetched(url):
+                navigation_start = time.perf_counter()
+                # Wait for the DOM (and body) to be ready under the configured page load strategy
+                navigate(self.driver, url, self.page_load_strategy)
+                
+                # Give a small buffer for dynamic content (optional but helpful)
+                time.sleep(1) 
+                self._record_navigation(time.perf_counter() - navigation_start)
 
+            if self.extract_mode == "dom":
+                text, links = self._extract_in_browser(url)
+                self._prefetch(next_url)
+                return text, links, False
+
+            # Only transfer and parsing are measured, as in dom mode; prefetching and the
+            # archive's compression are kept out of the CPU figure. thread_time() leaves out
+            # the summary workers and log listener running alongside the crawl loop
+            cpu_start = time.thread_time()
             page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Remove scripts, styles, and navigation to reduce noise
-            for script in soup(["script", "style", "nav", "footer", "header", "noscript"]):
-                script.decompose()
-
-            # Smart extraction: Limit to first 2 sections (roughly)
-            # Strategy: Collect text from paragraphs and headers until we see the 3rd h2 or hit a length limit.
-            content_parts = []
-            header_count = 0
-            char_count = 0
-            MAX_CHARS = 15000 # Hard cap to prevent memory issues before summarization truncates it
-            
-            # Find the main content area if possible (Wikipedia specific but good generic fallback)
-            main_content = soup.find(id="mw-content-text") or soup.find("main") or soup.find("article") or soup.body
-            
-            if main_content:
-                # Iterate over direct children or important tags
-                for element in main_content.find_all(['h1', 'h2', 'h3', 'p'], recursive=True):
-                    text_chunk = element.get_text(separator=' ', strip=True)
-                    
-                    # Stop if we encouter a "Stop Keyword" in a header
-                    if element.name in ['h1', 'h2', 'h3']:
-                        header_text_lower = text_chunk.lower()
-                        stop_keywords = ["exercise", "problem", "quiz", "question", "reference", "bibliography", "external link"]
-                        if any(keyword in header_text_lower for keyword in stop_keywords):
-                            self.logger.info(f"Skipping section: {text_chunk}")
-                            continue # Skip this header and potentially subsequent ps if we were smarter, but for now just skip strict sections if we could. 
-                            # Actually, a better approach for simple linear scrape:
-                            # If we hit an 'Exercise' header, we might want to stop COMPLETELY if it's at the end, 
-                            # or just skip this element. 
-                            # Given the user's issue, these usually appear at the end. Let's break? 
-                            # User said "The article includes... discussion questions at the end." -> BREAK is safer.
-                            self.logger.info("Hit pedagogical or footer section. Stopping extraction.")
-                            break
-
-                        header_count += 1
-                    
-                    if text_chunk:
-                        content_parts.append(text_chunk)
-                        char_count += len(text_chunk)
-                    
-                    # Stop if we have seen enough sections (Intro + 2 sections = ~3 headers usually)
-                    # or if we have enough text.
-                    if header_count >= 3 or char_count > MAX_CHARS:
-                        self.logger.info(f"Truncating content at {header_count} headers / {char_count} chars.")
-                        break
-            
-            if not content_parts:
-                 # Fallback to standard get_text if smart extraction failed
-                 text = soup.get_text(separator=' ', strip=True)
-            else:
-                text = " ".join(content_parts)
+            capture_cpu = time.thread_time() - cpu_start
+            self._prefetch(next_url)
 
-            return text, soup
+            cpu_start = time.thread_time()
+            text, soup = extract_content(page_source, url)
+            self._record_extraction(len(page_source.encode("utf-8")), capture_cpu + time.thread_time() - cpu_start)
+            if self.archive:
+                self.archive.append(url, page_source)
+            return text, soup, False
             
         except TimeoutException:
             self.logger.warning(f"Timeout loading page: {url}")
-            return None, None
+            return None, None, True
         except WebDriverException as e:
             self.logger.error(f"WebDriver error on {url}: {e}")
-            return None, None
+            return None, None, False
         except Exception as e:
             self.logger.error(f"Unexpected error on {url}: {e}")
-            return None, None
+            return None, None, False
+
+    def _reset_tabs(self):
+        self.main_window = self.driver.current_window_handle
+        self.prefetch_window = None
+        self.prefetch_url = None
+        self.prefetch_started = None
+
+    def _record_navigation(self, seconds):
+        if self.navigation_ewma is None:
+            self.navigation_ewma = seconds
+        else:
+            self.navigation_ewma = 0.8 * self.navigation_ewma + 0.2 * seconds
+
+    def _prefetch(self, next_url):
+        """Starts loading the probable next URL in the background tab."""
+        url = next_url() if next_url else None
+        if not url:
+            return
+        try:
+            # Opening the named window again navigates the existing background tab;
+            # the current window (and so every WebDriver command) stays on this page
+            self.driver.execute_script("window.open(arguments[0], arguments[1]);", url, PREFETCH_WINDOW)
+            if self.prefetch_window not in self.driver.window_handles:
+                self.prefetch_window = next(handle for handle in self.driver.window_handles if handle != self.main_window)
+        except (WebDriverException, StopIteration) as e:
+            self.logger.warning(f"Could not prefetch {url}: {e}")
+            return
+        self.prefetch_url = url
+        self.prefetch_started = time.perf_counter()
+        self.prefetches += 1
+        self.logger.debug(f"Prefetching {url} in the background tab")
+
+    def _use_prefetched(self, url):
+        """
+        If url was prefetched, makes its tab the current one (closing the old page's tab)
+        and waits until it is loaded. Returns False on a miss.
+        """
+        if self.prefetch_url != url:
+            if self.prefetch_url:
+                self.logger.debug(f"Prefetch miss: {self.prefetch_url} was loaded, {url} was requested")
+            # The background tab is reused by the next prefetch
+            self.prefetch_url = None
+            return False
+
+        wait_start = time.perf_counter()
+        self.driver.close()
+        self.driver.switch_to.window(self.prefetch_window)
+        self.main_window, self.prefetch_window, self.prefetch_url = self.prefetch_window, None, None
+        # Unnamed, so the next window.open opens a new background tab instead of replacing this page
+        self.driver.execute_script("window.name = '';")
+        wait_until_loaded(self.driver, self.page_load_strategy)
+        # Same settle time for dynamic content as a direct navigation, counted from the prefetch
+        time.sleep(max(0.0, 1 - (time.perf_counter() - self.prefetch_started)))
+        waited = time.perf_counter() - wait_start
+
+        self.prefetch_hits += 1
+        if self.navigation_ewma is not None:
+            self.prefetch_saved += max(0.0, self.navigation_ewma - waited)
+        self.logger.info(f"Prefetch hit for {url}: ready after {waited:.2f}s")
+        return True
+
+    def log_prefetch_stats(self):
+        if not self.prefetches:
+            return
+        # Saved time is measured against the running average of direct navigations
+        self.logger.info(
+            f"Prefetch: {self.prefetch_hits}/{self.prefetches} hits ({self.prefetch_hits / self.prefetches:.0%}), "
+            f"{self.prefetch_saved:.1f}s of page loading saved ({self.prefetch_saved / max(self.prefetch_hits, 1):.2f}s "
+            f"per hit vs. {self.navigation_ewma or 0:.2f}s per direct load)"
+        )
+
+    def _after_page(self, timed_out):
+        """Lets the supervisor look at the browser after a page; returns True if it was recycled."""
+        reason = self.supervisor.check(self.driver, timed_out)
+        if reason is None:
+            return False
+        self.recycle(reason)
+        return True
+
+    def recycle(self, reason):
+        """
+        Replaces the browser with a fresh one. The crawl frontier lives with the caller,
+        so the crawl simply continues with the next URL.
+        """
+        self.logger.warning(f"Recycling browser after {self.supervisor.pages} pages: {reason}")
+        try:
+            self.driver.quit()
+        except Exception as e:
+            # A hung browser may not answer quit(); make sure chromedriver goes away
+            self.logger.warning(f"Browser did not quit cleanly ({e}); killing chromedriver")
+            process = getattr(getattr(self.driver, "service", None), "process", None)
+            if process:
+                process.kill()
+        self.driver = self._setup_driver(self.headless)
+        self._reset_tabs()
+        self.supervisor.recycled(reason)
+
+    def _extract_in_browser(self, url):
+        cpu_start = time.thread_time()
+        result = extract_in_browser(self.driver, url)
+        links = resolve_links(result["hrefs"], url)
+        self._record_extraction(len(json.dumps(result).encode("utf-8")), time.thread_time() - cpu_start)
+
+        if result["stoppedAt"]:
+            self.logger.info(f"Hit pedagogical or footer section ({result['stoppedAt']}). Stopping extraction.")
+        for header in result["skipped"]:
+            self.logger.info(f"Skipping section: {header}")
+        if result["truncated"]:
+            self.logger.info(f"Truncating content at {result['headers']} headers / {result['chars']} chars.")
+        if self.archive:
+            # The archive stores full page sources, which dom mode would otherwise not transfer
+            self.archive.append(url, self.driver.page_source)
+        return result["text"], links
+
+    def _record_extraction(self, transferred, cpu_seconds):
+        self.extract_pages += 1
+        self.extract_bytes += transferred
+        self.extract_cpu += cpu_seconds
+
+    def log_extraction_stats(self):
+        if not self.extract_pages:
+            return
+        self.logger.info(
+            f"Extraction ({self.extract_mode} mode, {self.extract_pages} pages): "
+            f"avg {self.extract_bytes / self.extract_pages / 1024:.1f} KB transferred, "
+            f"avg {self.extract_cpu / self.extract_pages * 1000:.1f} ms CPU per page"
+        )
 
     def get_links(self, soup, base_url):
         """
         Extracts all valid hrefs from the soup object.
+        In dom mode get_page_content already returned the resolved links.
         """
-        if not soup:
-            return []
-            
-        links = []
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            
-            # Basic filtering
-            if href.startswith('http'):
-                links.append(href)
-            elif href.startswith('/'):
-                # Handle relative URLs
-                from urllib.parse import urljoin
-                full_url = urljoin(base_url, href)
-                links.append(full_url)
-                
-        # Remove duplicates
-        return list(set(links))
+        if isinstance(soup, list):
+            return soup
+        return extract_links(soup, base_url)
 
     def close(self):
+        self.log_extraction_stats()
+        self.log_prefetch_stats()
+        self.supervisor.log_summary()
         if self.driver:
             self.driver.quit()
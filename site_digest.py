@@ -0,0 +1,159 @@
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+DIGEST_INSTRUCTIONS = """You are combining summaries of pages from the same website into one summary.
+
+CRITICAL INSTRUCTIONS:
+1. Merge overlapping points and keep concrete facts, names and numbers.
+2. Only use what is in the summaries below. Do NOT add anything.
+3. Reply with the combined summary only, in at most 5 sentences."""
+
+# Page results that are not summaries and must not reach the digest
+_NOT_SUMMARIES = ("Error", "No content to summarize.", "No response from model.")
+
+
+def section_of(url):
+    """Section key of a page: host plus the first path segment."""
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split("/") if s]
+    return f"{parsed.netloc}/{segments[0]}" if segments else f"{parsed.netloc}/"
+
+
+class SiteDigest:
+    """
+    Reduces per-page summaries to one summary per section and one for the whole site.
+
+    Pages are grouped by section and reduced as a tree of at most `fanout` inputs per
+    LLM call (as many as fit in context_chars when each is capped at item_chars). A
+    group that is too big for one call is split into `fanout` buckets by a hash of each
+    item's label (the URL), recursively, so which batch a page lands in depends only on
+    its own URL, not on the pages around it. All calls at the same height of all trees
+    run in parallel. The section summaries are then reduced the same way into the site
+    summary.
+
+    Every call's output is cached under a hash of its inputs, so after a partial
+    re-crawl only the leaves containing changed summaries, and the nodes above them,
+    are recomputed. Entries the latest build no longer uses are dropped from the cache.
+    """
+
+    def __init__(self, ollama, workers=4, context_chars=12000, item_chars=1500, cache_path=None):
+        self.logger = logging.getLogger(__name__)
+        self.ollama = ollama
+        self.workers = max(1, workers)
+        self.item_chars = item_chars
+        self.fanout = max(2, context_chars // item_chars)
+        self.cache_path = cache_path
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as f:
+                self.cache = json.load(f)
+        self.calls = 0
+        self.cache_hits = 0
+        self.used = set()
+
+    def _key(self, items):
+        digest = hashlib.sha256(f"{self.ollama.model}\0{DIGEST_INSTRUCTIONS}".encode("utf-8"))
+        for label, text in items:
+            digest.update(f"\0{label}\0{text[:self.item_chars]}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _combine(self, items):
+        key = self._key(items)
+        self.used.add(key)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return key, cached
+
+        parts = [f"[SUMMARY {i} - {label}]\n{text[:self.item_chars]}" for i, (label, text) in enumerate(items, 1)]
+        prompt = "[BEGIN SUMMARIES]\n" + "\n\n".join(parts) + "\n[END SUMMARIES]"
+        self.calls += 1
+        text = self.ollama.generate(prompt, system=DIGEST_INSTRUCTIONS)
+        self.cache[key] = text
+        return key, text
+
+    def _plan(self, items, depth=0):
+        """
+        Tree of batches over items: {"items": [...]} for a leaf that fits in one call,
+        otherwise {"children": [...]} with the items bucketed by a hash of their label.
+        """
+        if len(items) <= self.fanout:
+            return {"items": items, "height": 0}
+        if depth >= 16:
+            # Only reachable with absurdly unlucky hashes; plain slices still terminate
+            chunks = [items[start:start + self.fanout] for start in range(0, len(items), self.fanout)]
+            children = [self._plan(chunk, depth + 1) for chunk in chunks]
+        else:
+            buckets = defaultdict(list)
+            for label, text in items:
+                digest = hashlib.sha256(f"{depth}\0{label}".encode("utf-8")).digest()
+                buckets[int.from_bytes(digest[:4], "big") % self.fanout].append((label, text))
+            children = [self._plan(bucket, depth + 1) for _, bucket in sorted(buckets.items())]
+        return {"children": children, "height": 1 + max(child["height"] for child in children)}
+
+    def _resolve(self, node):
+        """Sets node["output"] to (label, text); a single input is passed through without a call."""
+        items = node["items"] if "items" in node else [child["output"] for child in node["children"]]
+        if len(items) == 1:
+            node["output"] = items[0]
+            return
+        _, text = self._combine(items)
+        node["output"] = (f"{items[0][0].split(' .. ')[0]} .. {items[-1][0].split(' .. ')[-1]}", text)
+
+    def _reduce(self, groups):
+        """
+        Reduces every group (name -> [(label, text)]) to a single text, one tree height
+        at a time with all batches of a height in flight together.
+        """
+        plans = {name: self._plan(items) for name, items in groups.items() if items}
+        by_height = defaultdict(list)
+        stack = list(plans.values())
+        while stack:
+            node = stack.pop()
+            by_height[node["height"]].append(node)
+            stack.extend(node.get("children", []))
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="digest") as pool:
+            for height in sorted(by_height):
+                nodes = by_height[height]
+                self.logger.info(f"Digest level {height + 1}: {len(nodes)} batches")
+                list(pool.map(self._resolve, nodes))
+        return {name: plans[name]["output"][1] if name in plans else None for name in groups}
+
+    def build(self, results):
+        """
+        Returns {"site": text, "sections": {section: text}} for the url -> summary results.
+        Error results are skipped.
+        """
+        sections = {}
+        for url in sorted(results):
+            summary = results[url]
+            if not summary or summary.startswith(_NOT_SUMMARIES):
+                continue
+            sections.setdefault(section_of(url), []).append((url, summary))
+        if not sections:
+            return {"site": None, "sections": {}}
+
+        finished = False
+        try:
+            section_summaries = self._reduce(sections)
+            site = self._reduce({"site": sorted(section_summaries.items())})["site"]
+            finished = True
+        finally:
+            # Keep finished branches even if a later call failed; after a full build
+            # only what this build used is still reachable
+            if finished:
+                self.cache = {key: text for key, text in self.cache.items() if key in self.used}
+            if self.cache_path:
+                with open(self.cache_path, "w", encoding="utf-8") as f:
+                    json.dump(self.cache, f)
+        self.logger.info(
+            f"Site digest over {sum(len(items) for items in sections.values())} summaries in {len(sections)} sections: "
+            f"{self.calls} LLM calls, {self.cache_hits} cached"
+        )
+        return {"site": site, "sections": section_summaries}
@@ -0,0 +1,105 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+
+
+class SummaryPipeline:
+    """
+    Runs OllamaClient.generate_summary on a pool of worker threads so scraping does not
+    wait for the LLM. Summaries are written into the shared results dict; URLs are
+    reserved on submit so the report keeps crawl order. on_complete(url, seconds) is
+    called after every summary.
+
+    With clusters (a TopicClusters), each page is embedded with embed_model first and
+    pages that join an existing topic are not summarized; their result stays None until
+    TopicClusters.attach_summaries fills it in.
+    """
+
+    def __init__(self, ollama, results, workers=1, on_complete=None, clusters=None, embed_model=None):
+        self.logger = logging.getLogger(__name__)
+        self.ollama = ollama
+        self.results = results
+        self.on_complete = on_complete
+        self.clusters = clusters
+        self.embed_model = embed_model
+        self.submitted = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self.queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads = []
+        for i in range(max(1, workers)):
+            thread = threading.Thread(target=self._worker, name=f"summary-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, url, text, priority=0):
+        """Queues a page for summarization. Lower priority values are summarized first."""
+        self.results[url] = None
+        self.submitted += 1
+        self.queue.put((priority, next(self._seq), url, text))
+
+    def pending(self):
+        """Summaries waiting for a worker."""
+        return self.queue.qsize()
+
+    def outstanding(self):
+        """Summaries queued or in progress."""
+        return self.submitted - self.completed
+
+    def _worker(self):
+        while True:
+            priority, seq, url, text = self.queue.get()
+            try:
+                if url is None:
+                    return
+                if self.clusters and self._clustered(url, text):
+                    continue
+                self.logger.info(f"Summarizing content for {url}...")
+                start = time.time()
+                self.results[url] = self.ollama.generate_summary(text)
+                seconds = time.time() - start
+                self.logger.info(f"Summary generated for {url} in {seconds:.2f}s.",
+                                 extra={"url": url, "stage": "summarize", "duration": seconds})
+                if self.on_complete:
+                    self.on_complete(url, seconds)
+            except Exception as e:
+                self.logger.error(f"Summarization failed for {url}: {e}")
+                self.results[url] = f"Error analyzing content: {e}"
+            finally:
+                if url is not None:
+                    with self._lock:
+                        self.completed += 1
+                self.queue.task_done()
+
+    def _clustered(self, url, text):
+        """True if the page joined the cluster of an already summarized page."""
+        try:
+            embedding = self.ollama.embed([text[:8000]], self.embed_model)[0]
+            return self.clusters.assign(url, embedding) is not None
+        except Exception as e:
+            self.logger.warning(f"Could not embed {url}, summarizing it separately: {e}")
+            return False
+
+    def close(self, cancel=False):
+        """
+        Waits for queued summaries and stops the workers.
+        With cancel=True, pages that have not started yet are dropped instead.
+        """
+        if cancel:
+            while True:
+                try:
+                    _, _, url, _ = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.results[url] = "Error: Summarization cancelled."
+                with self._lock:
+                    self.completed += 1
+                self.queue.task_done()
+
+        for _ in self._threads:
+            self.queue.put((float("inf"), next(self._seq), None, None))
+        for thread in self._threads:
+            thread.join()
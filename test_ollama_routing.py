@@ -0,0 +1,100 @@
+import pytest
+
+import ollama_client
+from ollama_client import ROUTING_POLICIES, OllamaClient
+
+
+class FakeResponse:
+    def __init__(self, url):
+        self.url = url
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"response": f"summary from {self.url}", "prompt_eval_count": 10, "eval_count": 5}
+
+
+@pytest.mark.parametrize("routing", ROUTING_POLICIES)
+def test_requests_are_routed_across_endpoints(monkeypatch, routing):
+    served = []
+
+    def fake_post(url, json, timeout):
+        served.append(url)
+        return FakeResponse(url)
+
+    monkeypatch.setattr(ollama_client.requests, "post", fake_post)
+    client = OllamaClient(base_url=["http://a:11434", "http://b:11434"], routing=routing, max_retries=0)
+
+    summaries = [client.generate_summary(f"page {i}") for i in range(4)]
+
+    assert all(summary.startswith("summary from") for summary in summaries)
+    # Both endpoints get traffic; a cold endpoint is probed rather than skipped
+    assert {url.split("/api")[0] for url in served} == {"http://a:11434", "http://b:11434"}
+
+
+class FakeErrorResponse(FakeResponse):
+    def __init__(self, url, status):
+        super().__init__(url)
+        self.status_code = status
+
+    def raise_for_status(self):
+        raise ollama_client.requests.exceptions.HTTPError(f"{self.status_code} error", response=self)
+
+
+class FakeTags:
+    status_code = 200
+    text = ""
+
+    def __init__(self, models):
+        self.models = models
+
+    def json(self):
+        return {"models": [{"name": name} for name in self.models]}
+
+
+@pytest.mark.parametrize("routing", ROUTING_POLICIES)
+def test_retries_avoid_a_failing_endpoint(monkeypatch, routing):
+    served = []
+
+    def fake_post(url, json, timeout):
+        served.append(url)
+        if url.startswith("http://dead"):
+            return FakeErrorResponse(url, 500)
+        return FakeResponse(url)
+
+    monkeypatch.setattr(ollama_client.requests, "post", fake_post)
+    client = OllamaClient(base_url=["http://dead:11434", "http://ok:11434"], routing=routing,
+                          max_retries=2, backoff_base=0)
+
+    summaries = [client.generate_summary(f"page {i}") for i in range(5)]
+
+    assert all(summary.startswith("summary from http://ok") for summary in summaries)
+    # Only the very first attempt may go to the failing endpoint
+    assert sum(url.startswith("http://dead") for url in served) == 1
+
+
+def test_endpoint_without_the_model_is_not_admitted(monkeypatch):
+    tags = {"http://a:11434": ["mistral:latest"], "http://b:11434": ["llama3:latest"]}
+    monkeypatch.setattr(ollama_client.requests, "get", lambda url, timeout: FakeTags(tags[url.split("/api")[0]]))
+    client = OllamaClient(base_url=list(tags), model="mistral")
+
+    assert client.check_connection()
+    assert [endpoint.ejected for endpoint in client.endpoints] == [False, True]
+
+
+def test_embeddings_do_not_feed_the_hedge_latencies(monkeypatch):
+    def fake_post(url, json, timeout):
+        if url.endswith("/api/embed"):
+            response = FakeResponse(url)
+            response.json = lambda: {"embeddings": [[0.0, 1.0]]}
+            return response
+        return FakeResponse(url)
+
+    monkeypatch.setattr(ollama_client.requests, "post", fake_post)
+    client = OllamaClient(base_url="http://a:11434", max_retries=0)
+
+    client.embed(["page"], "nomic-embed-text")
+    assert len(client._attempt_latencies) == 0
+    client.generate_summary("page")
+    assert len(client._attempt_latencies) == 1
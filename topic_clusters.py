@@ -0,0 +1,92 @@
+import logging
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TopicClusters:
+    """
+    Groups pages about the same story by the cosine similarity of their embeddings.
+
+    Clustering is online and greedy, so it works while the crawl is running: a page joins
+    the cluster of the most similar representative if that similarity reaches the
+    threshold, otherwise it becomes the representative of a new cluster. Only
+    representatives are summarized; members get their representative's summary.
+
+    Representative vectors are kept L2-normalized in one NumPy matrix (grown by doubling),
+    so assigning a page is a single matrix-vector product.
+    """
+
+    def __init__(self, threshold=0.9):
+        if np is None:
+            raise ImportError("The 'numpy' package is required for --cluster (pip install numpy).")
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.matrix = None
+        self.representatives = []
+        self.members = {}  # representative url -> [member urls]
+        self.cluster_of = {}  # url -> representative url
+        self._lock = threading.Lock()  # pages are assigned from the summary workers
+
+    def _append(self, vector):
+        count = len(self.representatives)
+        if self.matrix is None:
+            self.matrix = np.empty((16, vector.shape[0]), dtype=np.float32)
+        elif self.matrix.shape[1] != vector.shape[0]:
+            raise ValueError(f"Embedding size changed from {self.matrix.shape[1]} to {vector.shape[0]}")
+        if count == self.matrix.shape[0]:
+            grown = np.empty((count * 2, self.matrix.shape[1]), dtype=np.float32)
+            grown[:count] = self.matrix
+            self.matrix = grown
+        self.matrix[count] = vector
+
+    def assign(self, url, embedding):
+        """
+        Places the page in a cluster. Returns the representative's url if the page joined
+        an existing cluster, or None if it is the representative of a new one.
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        with self._lock:
+            return self._assign(url, vector)
+
+    def _assign(self, url, vector):
+        count = len(self.representatives)
+        if count:
+            similarities = self.matrix[:count] @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                representative = self.representatives[best]
+                self.members[representative].append(url)
+                self.cluster_of[url] = representative
+                self.logger.info(f"{url} matches {representative} (similarity {similarities[best]:.3f}), not summarized separately")
+                return representative
+
+        self._append(vector)
+        self.representatives.append(url)
+        self.members[url] = []
+        self.cluster_of[url] = url
+        return None
+
+    def attach_summaries(self, results):
+        """Copies each representative's summary to the members of its cluster."""
+        for representative, members in self.members.items():
+            summary = results.get(representative)
+            for url in members:
+                results[url] = summary
+
+    def log_summary(self):
+        pages = len(self.cluster_of)
+        clusters = len(self.representatives)
+        if not pages:
+            return
+        largest = max(len(members) + 1 for members in self.members.values())
+        self.logger.info(
+            f"Topic clusters: {pages} pages in {clusters} clusters (largest {largest}), "
+            f"{pages - clusters} summaries skipped ({pages / clusters:.1f}x fewer LLM calls)"
+        )